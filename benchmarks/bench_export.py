@@ -0,0 +1,42 @@
+"""Time the Excel template fill for growing numbers of entries.
+
+Run from the project folder:  python benchmarks/bench_export.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl
+
+from benchmarks.legacy import legacy_fill
+from benchmarks.synthetic import make_entries
+from weighstation.export import fill_template
+
+TEMPLATE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "comparison.xlsx")
+SIZES = [100, 1000, 10000, 50000]
+LEGACY_MAX = 2000  # the old row scan is quadratic, keep it short
+
+
+def time_fill(fill, entries):
+    sheet = openpyxl.load_workbook(TEMPLATE).active
+    start = time.perf_counter()
+    fill(sheet, "D STATION NO. 1", entries)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'rows':>8} {'engine ms':>10} {'us/row':>8} {'legacy ms':>10} {'us/row':>8}")
+    for size in SIZES:
+        entries = make_entries(size)
+        elapsed = time_fill(fill_template, entries)
+        line = f"{size:>8} {elapsed * 1000:>10.1f} {elapsed / size * 1e6:>8.2f}"
+        if size <= LEGACY_MAX:
+            legacy = time_fill(legacy_fill, entries)
+            line += f" {legacy * 1000:>10.1f} {legacy / size * 1e6:>8.2f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""The v1.1/v1.2 implementations of the hot paths, kept as a baseline"""
+import json
+import os
+
+
+def legacy_fill(sheet, station, entries):
+    """Row placement used by print_data() up to v1.2 (rescans column B per entry)"""
+    sheet['A1'] = f"{station} WEIGH STATION"
+    for i, entry in enumerate(entries):
+        if i == 0:
+            row = 8
+            sheet['B2'] = entry['date']
+        else:
+            row = 9
+            while sheet[f'B{row}'].value is not None:
+                row += 1
+        sheet[f'B{row}'] = int(entry['axle_class'])
+        sheet[f'C{row}'] = entry['plate_number']
+        sheet[f'D{row}'] = entry['cargo_type']
+        sheet[f'E{row}'] = int(entry['ramp_bridge'])
+        sheet[f'F{row}'] = int(entry['static_scale'])
+        sheet[f'H{row}'] = int(entry['speed'])
+
+
+def legacy_backup(backup_dir, input_history):
+    """backup_input_history() up to v1.2: rewrite the whole list on every save"""
+    os.makedirs(backup_dir, exist_ok=True)
+    autosave_path = os.path.join(backup_dir, "autosave_input_history.json")
+    with open(autosave_path, "w") as f:
+        json.dump(input_history, f)
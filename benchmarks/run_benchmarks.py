@@ -0,0 +1,216 @@
+"""Benchmark suite for the save, autosave, export and screenshot hot paths.
+
+Run from the project folder:
+
+    python benchmarks/run_benchmarks.py --label v1.3
+    python benchmarks/run_benchmarks.py --sizes 100 1000 10000 100000
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/v1.2.json benchmarks/results/v1.3.json
+
+Every run is written to benchmarks/results/<label>.json. The "legacy" cases
+time the v1.1/v1.2 implementations on the same data, so one run already
+shows the old and new code side by side. --compare prints two result files
+next to each other with the ratio.
+"""
+import argparse
+import io
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.legacy import legacy_backup, legacy_fill
+from benchmarks.startup_budget import startup_imports
+from benchmarks.synthetic import make_entries, make_values
+from weighstation.engine import Engine
+from weighstation.history import SessionHistory
+from weighstation.journal import Journal
+
+TEMPLATE = os.path.join(ROOT, "data", "comparison.xlsx")
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SIZES = [100, 1000, 10000]
+LEGACY_LIMITS = {"autosave": 1000, "export_fill": 2000}  # quadratic baselines
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def result(seconds, items):
+    return {"seconds": round(seconds, 6), "items": items,
+            "per_item_us": round(seconds / max(items, 1) * 1e6, 3)}
+
+
+def bench_save_entry(size, workdir):
+    """Engine.save_entry: validate, SQLite insert, history, plate directory, journal"""
+    engine = Engine(workdir, TEMPLATE)
+    rows = make_values(size)
+
+    def run():
+        for station, date_text, values in rows:
+            engine.save_entry(station, date_text, values)
+
+    seconds = timed(run)
+    engine.close()
+    return result(seconds, size)
+
+
+def bench_autosave(size, workdir, legacy=False):
+    entries = make_entries(size)
+    if legacy:
+        history = []
+
+        def run():
+            for entry in entries:
+                history.append(entry)
+                legacy_backup(workdir, history)
+    else:
+        journal = Journal(workdir)
+        # Compact the session as it stands at that point, as Engine.autosave() does
+        history = SessionHistory(os.path.join(workdir, "session_spill.jsonl"))
+
+        def run():
+            for entry in entries:
+                history.append(entry)
+                journal.append(entry)
+                if journal.needs_compaction():
+                    journal.compact(history)
+
+    return result(timed(run), size)
+
+
+def bench_export_fill(size, legacy=False):
+    from weighstation.export import fill_template
+    from weighstation.template import TemplateCache
+    entries = make_entries(size)
+    sheet = TemplateCache(TEMPLATE).load().active
+    fill = legacy_fill if legacy else fill_template
+    return result(timed(lambda: fill(sheet, "D STATION NO. 1", entries)), size)
+
+
+def bench_export_save(size, workdir, extension="xlsx"):
+    """Engine.export: template copy, fill and workbook save (or a CSV/.npz table)"""
+    engine = Engine(workdir, TEMPLATE)
+    entries = make_entries(size)
+    path = os.path.join(workdir, f"export.{extension}")
+    seconds = timed(lambda: engine.export(path, "D STATION NO. 1", entries))
+    engine.close()
+    return result(seconds, size)
+
+
+def bench_screenshot_encode(repeat=5):
+    """Encode a synthetic 1920x1080 desktop with each built-in capture profile"""
+    from PIL import Image
+    from weighstation import capture
+    image = Image.effect_noise((1920, 1080), 40).convert("RGB")
+    results = {}
+    settings = capture.CaptureSettings()
+    for name in capture.DEFAULT_PROFILES:
+        settings.default = name
+        profile = settings.profile_for("")
+        sizes = []
+        start = time.perf_counter()
+        for _ in range(repeat):
+            buffer = io.BytesIO()
+            sizes.append(capture.encode(image, profile, buffer)[0])
+        entry = result(time.perf_counter() - start, repeat)
+        entry["bytes"] = sizes[-1]
+        results[name] = entry
+    return results
+
+
+def bench_startup_import(repeat=5):
+    """Median wall time of a fresh interpreter importing what the app imports at startup"""
+    code = "\n".join(["import time", "t = time.perf_counter()"] + startup_imports() +
+                     ["print(time.perf_counter() - t)"])
+    times = []
+    for _ in range(repeat):
+        output = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+        times.append(float(output.stdout.strip()))
+    times.sort()
+    return result(times[len(times) // 2], 1)
+
+
+def run_suite(sizes):
+    results = {}
+
+    def record(name, size, value):
+        results.setdefault(name, {})[str(size)] = value
+        print(f"{name:<24} {size:>8} {value['seconds'] * 1000:>10.1f} ms {value['per_item_us']:>10.1f} us/item")
+
+    for size in sizes:
+        for name, run in (
+                ("save_entry", lambda workdir: bench_save_entry(size, workdir)),
+                ("autosave", lambda workdir: bench_autosave(size, workdir)),
+                ("autosave_legacy", lambda workdir: bench_autosave(size, workdir, legacy=True)),
+                ("export_fill", lambda workdir: bench_export_fill(size)),
+                ("export_fill_legacy", lambda workdir: bench_export_fill(size, legacy=True)),
+                ("export_save", lambda workdir: bench_export_save(size, workdir)),
+                ("export_csv", lambda workdir: bench_export_save(size, workdir, "csv")),
+                ("export_npz", lambda workdir: bench_export_save(size, workdir, "npz"))):
+            base_name = name.replace("_legacy", "")
+            if name.endswith("_legacy") and size > LEGACY_LIMITS.get(base_name, 0):
+                continue
+            workdir = tempfile.mkdtemp(prefix="weighstation-bench-")
+            try:
+                record(name, size, run(workdir))
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+
+    for profile, value in bench_screenshot_encode().items():
+        record(f"screenshot_{profile}", 1920 * 1080, value)
+    record("startup_import", 1, bench_startup_import())
+    return results
+
+
+def compare(old_path, new_path):
+    with open(old_path) as f:
+        old = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+    print(f"{'benchmark':<24} {'size':>8} {old['label']:>12} {new['label']:>12} {'ratio':>7}")
+    for name, sizes in new["results"].items():
+        for size, value in sizes.items():
+            before = old["results"].get(name, {}).get(size)
+            if before is None:
+                continue
+            ratio = value["seconds"] / before["seconds"] if before["seconds"] else float("inf")
+            print(f"{name:<24} {size:>8} {before['seconds'] * 1000:>10.1f}ms {value['seconds'] * 1000:>10.1f}ms {ratio:>6.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--label", default="current", help="name of the result file (e.g. the app version)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = run_suite(args.sizes)
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f"{args.label}.json")
+    with open(path, "w") as f:
+        json.dump({
+            "label": args.label,
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "results": results,
+        }, f, indent=2)
+    print(f"Results written to {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Check that the app's startup imports stay within a time budget.
+
+Runs a fresh interpreter with -X importtime on the modules that
+comparison_app_1.2.py imports at the top level (read from the script, so
+the list cannot go stale), prints the slowest ones and exits with status 1
+when the total goes over the budget or a module that should only load on
+first use (openpyxl, Pillow, ...) is pulled in at startup. It also fails
+when a load_icon() call in the app has no pre-sized copy in assets/sized,
+since load_icon() would then import Pillow to resize the original.
+
+    python benchmarks/startup_budget.py
+    python benchmarks/startup_budget.py --budget-ms 250 --top 15
+
+Run it on the oldest station PC before a release; the budget is the median
+of --repeat runs so one slow disk read does not fail it.
+"""
+import argparse
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_SCRIPT = os.path.join(ROOT, "comparison_app_1.2.py")
+DEFAULT_BUDGET_MS = 300
+# Only needed for export, screenshots, the icon fallback or live scales
+DEFERRED_MODULES = ("openpyxl", "PIL", "tkcalendar", "numpy", "asyncio")
+
+
+def startup_imports(script=APP_SCRIPT):
+    """The import statements at the top level of script, in order"""
+    with open(script, encoding="utf-8") as f:
+        source = f.read()
+    return [ast.get_source_segment(source, node) for node in ast.parse(source).body
+            if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def startup_icons(script=APP_SCRIPT):
+    """(name, size) of every load_icon("name", size) call in script"""
+    with open(script, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    icons = []
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == "load_icon"
+                and len(node.args) == 2 and all(isinstance(arg, ast.Constant) for arg in node.args)):
+            icons.append((node.args[0].value, node.args[1].value))
+    return icons
+
+
+def unsized_icons(icons, assets_dir=os.path.join(ROOT, "assets")):
+    """The icons load_icon() would have to resize with Pillow at startup"""
+    sys.path.insert(0, ROOT)
+    from weighstation.icons import SIZED_FOLDER, sized_name
+    return [(name, size) for name, size in icons
+            if not os.path.exists(os.path.join(assets_dir, SIZED_FOLDER, sized_name(name, size)))
+            and os.path.exists(os.path.join(assets_dir, name))]
+
+
+def import_times(statements):
+    """Run -X importtime; returns (total_us, {module: (self_us, cumulative_us)})"""
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c", "\n".join(statements)],
+                            cwd=ROOT, capture_output=True, text=True)
+    if output.returncode != 0:
+        raise RuntimeError(output.stderr.strip().splitlines()[-1])
+    times = {}
+    for line in output.stderr.splitlines():
+        # import time:   self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = len(name) - len(name.lstrip())
+        times[name.strip()] = (int(self_us), int(cumulative_us), depth)
+    top_level = min((depth for _, _, depth in times.values()), default=0)
+    total = sum(cumulative for _, cumulative, depth in times.values() if depth == top_level)
+    return total, {name: (self_us, cumulative) for name, (self_us, cumulative, _) in times.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="number of slowest modules to list")
+    args = parser.parse_args()
+
+    statements = startup_imports()
+    try:
+        runs = sorted((import_times(statements) for _ in range(args.repeat)), key=lambda run: run[0])
+    except RuntimeError as e:
+        print(f"FAIL: the startup imports do not run here: {e}")
+        sys.exit(1)
+    total_us, times = runs[len(runs) // 2]
+
+    print(f"Startup imports: {len(statements)} statements")
+    print(f"{'module':<40} {'self ms':>8} {'total ms':>9}")
+    slowest = sorted(times.items(), key=lambda item: item[1][0], reverse=True)[:args.top]
+    for name, (self_us, cumulative_us) in slowest:
+        print(f"{name:<40} {self_us / 1000:>8.1f} {cumulative_us / 1000:>9.1f}")
+
+    failed = False
+    loaded = [name for name in times if name.split(".")[0] in DEFERRED_MODULES]
+    if loaded:
+        print(f"FAIL: imported at startup but should load on first use: {', '.join(loaded)}")
+        failed = True
+    icons = startup_icons()
+    unsized = unsized_icons(icons)
+    if unsized:
+        print(f"FAIL: no pre-sized copy, so Pillow is imported at startup for: "
+              f"{', '.join(f'{name} at {size}px' for name, size in unsized)} (run python -m weighstation.icons)")
+        failed = True
+    else:
+        print(f"OK: all {len(icons)} startup icons load without Pillow")
+    total_ms = total_us / 1000
+    if total_ms > args.budget_ms:
+        print(f"FAIL: startup imports took {total_ms:.0f} ms, budget is {args.budget_ms:.0f} ms")
+        failed = True
+    else:
+        print(f"OK: startup imports took {total_ms:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
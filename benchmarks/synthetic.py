@@ -0,0 +1,46 @@
+"""Synthetic truck entries for the benchmarks"""
+import random
+from datetime import date, timedelta
+
+from weighstation.stations import STATIONS
+
+CARGO_TYPES = ["SAND", "SEWAGE WATER", "CEMENT", "DRINKING WATER", "OIL AND GAS", "OTHERS",
+               "READYMIX CEMENT", "AGRICULTURAL PRODUCTS", "ASPHALT", "BLOCKS",
+               "STEEL", "LIVE STOCKS", "CONSTRUCTION DEBRIS", "STONE"]
+
+
+def make_values(count, seed=0, days=30):
+    """(station, date, form values) tuples spread over all stations and `days` days"""
+    rng = random.Random(seed)
+    start = date(2025, 1, 1)
+    rows = []
+    for i in range(count):
+        static = rng.randint(8000, 60000)
+        rows.append((
+            STATIONS[i % len(STATIONS)],
+            (start + timedelta(days=i * days // max(count, 1))).strftime("%B %d, %Y"),
+            {
+                'axle_class': str(rng.choice((11, 12, 22, 23, 24, 33))),
+                'plate_number': str(rng.randint(1000, 99999)),
+                'cargo_type': rng.choice(CARGO_TYPES),
+                'ramp_bridge': str(static + rng.randint(-400, 400)),
+                'static_scale': str(static),
+                'speed': str(rng.randint(3, 25)),
+            },
+        ))
+    return rows
+
+
+def make_entries(count, seed=0, days=30):
+    """Entry dicts as save_data() would store them"""
+    return [{
+        'station': station,
+        'date': date_text,
+        'axle_class': int(values['axle_class']),
+        'plate_number': values['plate_number'],
+        'cargo_type': values['cargo_type'],
+        'ramp_bridge': int(values['ramp_bridge']),
+        'static_scale': int(values['static_scale']),
+        'speed': int(values['speed']),
+        'destination': "",
+    } for station, date_text, values in make_values(count, seed, days)]
@@ -1,13 +1,23 @@
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
-from PIL import ImageGrab, Image, ImageTk
-import time
 import os
-import openpyxl
 import sys
+from importlib.util import find_spec
 from datetime import datetime
-import json
-from tkcalendar import DateEntry
+from weighstation import capture
+from weighstation.completion import CompletionIndex, load_vocabulary
+from weighstation.engine import Engine
+from weighstation.entry import ValidationError, check_required
+from weighstation.export import ExportCancelled
+from weighstation.icons import SIZED_FOLDER, resize, sized_name
+from weighstation.metrics import describe
+from weighstation.search import RowIndex, date_key, number_key, text_key
+from weighstation.stations import STATIONS, export_file_name
+from weighstation.store import EntryStore
+from weighstation.summary import load_limits
+from weighstation.tabular import is_table_path
+from weighstation.validators import validate_integer, validate_axle_class_input, validate_plate_number
+from weighstation.worker import BackgroundJob
 date_edit_mode = False
 
 def resource_path(relative_path):
@@ -17,22 +27,76 @@ def resource_path(relative_path):
     return os.path.join(os.path.abspath("."), relative_path)
 
 excel_path = resource_path("data\\comparison.xlsx")
-excel_path = resource_path("data\\comparison.xlsx")
-excel_icon_path = resource_path("assets\\excel.png")
-save_icon_path = resource_path("assets\\save.png")
-camera_icon_path = resource_path("assets\\camera.png")
-view_history_icon_path = resource_path("assets\\clock.png")
-reset_icon_path = resource_path("assets\\reset.png")
-browse_icon_path = resource_path("assets\\open-folder.png")
-confirm_icon_path = resource_path("assets\\check.png")
-change_date_icon_path = resource_path("assets\\exchange.png")
-revert_icon_path = resource_path("assets\\revert.png")
-workbook = openpyxl.load_workbook(excel_path)
-sheet = workbook.active
+icon_cache = {}
+
+def load_icon(name, size):
+    """PhotoImage of assets/<name> at size x size, loaded once per run.
+
+    Uses the pre-sized copy in assets/sized (python -m weighstation.icons)
+    so Pillow is not imported at startup; resizes the original if the copy
+    is missing, and falls back to a blank image (still without Pillow) if
+    the icon itself is.
+    """
+    key = (name, size)
+    if key not in icon_cache:
+        sized_path = resource_path(os.path.join("assets", SIZED_FOLDER, sized_name(name, size)))
+        original_path = resource_path(os.path.join("assets", name))
+        try:
+            if os.path.exists(sized_path):
+                icon_cache[key] = tk.PhotoImage(file=sized_path)
+            elif os.path.exists(original_path):
+                from PIL import ImageTk
+                icon_cache[key] = ImageTk.PhotoImage(resize(original_path, size))
+            else:
+                print(f"Missing icon: {name}")
+                icon_cache[key] = tk.PhotoImage(width=size, height=size)
+        except Exception as e:
+            print(f"Failed to load icon {name}: {e}")
+            icon_cache[key] = tk.PhotoImage(width=size, height=size)
+    return icon_cache[key]
 
 screenshot_taken = False  
-input_history = []
-MAX_HISTORY = 100
+MAX_HISTORY = 100  # entries kept in memory, older ones spill to disk
+export_job = None
+export_saving = False  # the running export is past the point where it can be cancelled
+screenshot_job = None
+try:
+    capture_settings = capture.CaptureSettings.load(os.path.join(os.path.abspath("."), "capture_profiles.json"))
+except Exception as e:
+    print(f"Failed to load capture profiles, using full screen: {e}")
+    capture_settings = capture.CaptureSettings()
+scale_ingest = None  # weights are typed by hand unless scale.json sets up the indicators
+scale_config_path = os.path.join(os.path.abspath("."), "scale.json")
+if os.path.exists(scale_config_path):
+    try:
+        from weighstation.scale import ScaleIngest  # asyncio is only imported when needed
+        scale_ingest = ScaleIngest.load(scale_config_path)
+    except Exception as e:
+        print(f"Failed to load scale settings, weights will be typed by hand: {e}")
+
+# Validation, storage, autosave and export live in the Tk-free weighstation package
+try:
+    axle_limits = load_limits(os.path.join(os.path.abspath("."), "axle_limits.json"))
+except Exception as e:
+    print(f"Failed to load axle limits, overweight trucks will not be counted: {e}")
+    axle_limits = {}
+engine = Engine(os.path.abspath("."), excel_path, MAX_HISTORY, axle_limits)
+input_history = engine.history
+entry_store = engine.store
+plate_directory = engine.plates
+metrics = engine.metrics  # logs/metrics.jsonl
+try:
+    engine.load_plates()
+except Exception as e:
+    print(f"Failed to load plate directory: {e}")
+try:
+    engine.load_summary()
+except Exception as e:
+    print(f"Failed to load daily summary: {e}")
+try:
+    engine.load_duplicates()
+except Exception as e:
+    print(f"Failed to load duplicate index: {e}")
 
 
 class ToolTip:
@@ -63,87 +127,446 @@ class ToolTip:
             self.tip_window = None
 
 
-def save_data():
-    """Store input data in memory (up to 100 entries)"""
-    global screenshot_taken
+class HistoryViewer:
+    """History window that only materializes the rows on screen.
 
-    try:
-        # First check: Is station selected?
-        if not station_var.get():
-            messagebox.showwarning("Warning", "Please select a station first.")
+    The stored entries are read once, on a worker thread, into a list of
+    row tuples and kept up to date by add() and mark_exported(). The Treeview holds at most
+    VISIBLE_ROWS items whose values are swapped as the user scrolls, so
+    opening and scrolling cost the same with 50 or 50,000 rows. The window
+    is built once and hidden instead of destroyed when closed.
+
+    The plate filter and column sorting go through a RowIndex, so they only
+    change which row numbers are shown (self.view) instead of re-inserting
+    items.
+    """
+
+    VISIBLE_ROWS = 13
+
+    # Display names and column widths
+    COLUMN_CONFIG = {
+        "#": ("#", 50),
+        "date": ("Date", 120),
+        "station": ("Station", 130),
+        "axle_class": ("Axle Class", 80),
+        "plate_number": ("Plate Number", 120),
+        "cargo_type": ("Cargo Type", 150),
+        "ramp_bridge": ("Ramp Weight", 100),
+        "static_scale": ("Static Weight", 100),
+        "speed": ("Speed", 60),
+        "exported": ("Exported", 70),
+    }
+
+    # Sort key per column, in the same order as COLUMN_CONFIG and the row tuples
+    SORT_KEYS = dict(enumerate((number_key, date_key, text_key, number_key, text_key,
+                                text_key, number_key, number_key, number_key, text_key)))
+    PLATE_COLUMN = 4
+    EXPORTED_COLUMN = 9
+    STORE_COLUMNS = ("id", "date", "station", "axle_class", "plate_number", "cargo_type",
+                     "ramp_bridge", "static_scale", "speed", "exported_at")
+
+    def __init__(self, store):
+        self.store = store
+        self.rows = None       # (id, date, station, ..., exported) per entry, oldest first
+        self.positions = {}    # entry id -> index in rows
+        self.index = None
+        self.loading = None    # BackgroundJob reading the store
+        self.pending = []      # entries saved while loading
+        self.pending_exported = []
+        self.view = None       # row numbers to show, None for all rows in order
+        self.sort_column = None
+        self.descending = False
+        self.first = 0         # position of the top visible row in the view
+        self.win = None
+        self.tree = None
+        self.vsb = None
+        self.filter_var = None
+        self.count_label = None
+
+    @staticmethod
+    def row_values(entry):
+        return (entry.get('id'), entry.get('date', ""), entry.get('station', ""),
+                entry.get('axle_class', ""), entry.get('plate_number', ""), entry.get('cargo_type', ""),
+                entry.get('ramp_bridge', ""), entry.get('static_scale', ""), entry.get('speed', ""),
+                "Yes" if entry.get('exported_at') else "")
+
+    @classmethod
+    def read_rows(cls, path):
+        """Row tuples and their RowIndex; runs on a worker thread with its own connection"""
+        store = EntryStore(path)
+        try:
+            rows = [row[:-1] + ("Yes" if row[-1] else "",) for row in store.columns(cls.STORE_COLUMNS)]
+        finally:
+            store.close()
+        return rows, RowIndex(rows, cls.PLATE_COLUMN, cls.SORT_KEYS)
+
+    def load(self):
+        """Start reading the store in the background; show() runs again when it is done"""
+        if self.loading is not None:
             return
+        status_label.config(text="Loading history...", bg="skyblue", fg="black")
+        self.loading = BackgroundJob(root.after, lambda job: self.read_rows(self.store.path),
+                                     on_done=self.loaded, on_error=self.load_failed)
+        self.loading.start()
+
+    def loaded(self, result):
+        self.loading = None
+        self.rows, self.index = result
+        self.positions = {row[0]: idx for idx, row in enumerate(self.rows)}
+        # Catch up with saves and exports made while the store was being read
+        for entry in self.pending:
+            if entry['id'] not in self.positions:
+                self.add(entry)
+        self.mark_exported(self.pending_exported)
+        self.pending, self.pending_exported = [], []
+        status_label.config(text="Ready", bg="green", fg="white")
+        self.show()
+
+    def load_failed(self, error):
+        self.loading = None
+        self.pending, self.pending_exported = [], []
+        status_label.config(text="Ready", bg="green", fg="white")
+        messagebox.showerror("Error", f"Failed to load history:\n{error}")
 
-        # Second check: Is date entered?
-        if not date_entry.get().strip():
-            messagebox.showwarning("Warning", "Please enter the date first.")
+    def is_open(self):
+        return self.win is not None and self.win.state() != "withdrawn"
+
+    def show(self):
+        if self.rows is None:
+            self.load()
             return
-        
-        # Third check: Are all required fields filled?
-        axle_class = entry_vars['AXLE CLASS'].get().strip()
-        plate_number = entry_vars['PLATE NUMBER'].get().strip().upper()
-        cargo_type = entry_vars['CARGO TYPE'].get().strip()
-        ramp_bridge = entry_vars['RAMP BRIDGE WEIGHT'].get().strip()
-        static_scale = entry_vars['STATIC SCALE WEIGHT'].get().strip()
-        speed = entry_vars['SPEED'].get().strip()
-
-        if not (axle_class and plate_number and cargo_type and ramp_bridge and static_scale and speed):
-            messagebox.showwarning("Warning", "Please complete all the details first.")
+        if not self.rows:
+            messagebox.showinfo("History", "No history available.")
             return
+        if self.win is None:
+            self.build()
+        else:
+            self.win.deiconify()
+            self.win.lift()
+        self.first = self.max_first()  # Open at the newest entries
+        self.render()
+
+    def add(self, entry):
+        """Called by save_data() after an entry is stored"""
+        if self.rows is None:
+            if self.loading is not None:
+                self.pending.append(entry)
+            return  # Not loaded yet, the next show() reads it from the store
+        at_bottom = self.first >= self.max_first()
+        self.positions[entry['id']] = len(self.rows)
+        self.rows.append(self.row_values(entry))
+        self.index.add(len(self.rows) - 1)
+        self.refresh_view()
+        if self.is_open():
+            if at_bottom:
+                self.first = self.max_first()
+            self.render()
+
+    def mark_exported(self, ids):
+        if self.rows is None:
+            if self.loading is not None:
+                self.pending_exported.extend(ids)
+            return
+        for entry_id in ids:
+            idx = self.positions.get(entry_id)
+            if idx is not None:
+                self.rows[idx] = self.rows[idx][:-1] + ("Yes",)
+                self.index.update(idx, self.EXPORTED_COLUMN)
+        if self.sort_column == self.EXPORTED_COLUMN:
+            self.refresh_view()
+        if self.is_open():
+            self.render()
+
+    def build(self):
+        self.win = tk.Toplevel(root)
+        self.win.title("Input History")
+        screen_width = self.win.winfo_screenwidth()
+        screen_height = self.win.winfo_screenheight()
+        x = (screen_width / 2) - (950 / 2)
+        y = (screen_height / 2) - (400 / 2)
+        self.win.geometry(f"950x400+{int(x)}+{int(y)}")
+        self.win.resizable(False, False)
+        self.win.protocol("WM_DELETE_WINDOW", self.win.withdraw)
+
+        icon_path = resource_path("assets\\dump-truck.ico")
+        try:
+            self.win.iconbitmap(icon_path)
+        except Exception as e:
+            print(f"Icon load failed: {e}")
+
+        columns = list(self.COLUMN_CONFIG)
+
+        # Filter bar
+        filter_frame = tk.Frame(self.win)
+        filter_frame.pack(fill='x', padx=5, pady=3)
+        tk.Label(filter_frame, text="Search plate:", font=('Arial', 10, 'bold')).pack(side='left')
+        self.filter_var = tk.StringVar()
+        filter_entry = tk.Entry(filter_frame, textvariable=self.filter_var, width=20)
+        filter_entry.pack(side='left', padx=5)
+        self.count_label = tk.Label(filter_frame, text="", font=('Arial', 10))
+        self.count_label.pack(side='right')
+        self.filter_var.trace_add('write', lambda *args: self.apply_filter())
+
+        # Treeview styling
+        style = ttk.Style()
+        style.configure("History.Treeview",
+                        background="white",
+                        foreground="black",
+                        rowheight=25,
+                        fieldbackground="white",
+                        font=('Arial', 10))
+        style.configure("History.Treeview.Heading",
+                        background="lightgray",
+                        foreground="black",
+                        font=('Arial', 10, 'bold'),
+                        relief="raised")
+        style.map("History.Treeview",
+                  background=[("selected", "#d0e0ff")],
+                  foreground=[("selected", "black")])
+
+        # Frame for Treeview + scrollbars
+        tree_frame = tk.Frame(self.win)
+        tree_frame.pack(fill='both', expand=True)
+
+        # The vertical scrollbar drives our row window, not the Treeview itself
+        self.vsb = ttk.Scrollbar(tree_frame, orient="vertical", command=self.on_scroll)
+        self.vsb.pack(side="right", fill="y")
+
+        hsb = ttk.Scrollbar(tree_frame, orient="horizontal")
+        hsb.pack(side="bottom", fill="x")
+
+        self.tree = ttk.Treeview(tree_frame, columns=columns, show='headings', height=self.VISIBLE_ROWS,
+                                 xscrollcommand=hsb.set, style="History.Treeview")
+        self.tree.pack(fill='both', expand=True)
+        hsb.config(command=self.tree.xview)
+
+        for position, col in enumerate(columns):
+            heading, width = self.COLUMN_CONFIG[col]
+            self.tree.heading(col, text=heading, anchor="center",
+                              command=lambda position=position: self.sort_by(position))
+            self.tree.column(col, width=width, anchor="center")
+
+        self.tree.tag_configure('oddrow', background='#f0f0f0')
+        self.tree.tag_configure('evenrow', background='white')
+
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_by(-3 if event.delta > 0 else 3))
+        self.tree.bind("<Button-4>", lambda event: self.scroll_by(-3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_by(3))
+        self.tree.bind("<Prior>", lambda event: self.scroll_by(-self.VISIBLE_ROWS))
+        self.tree.bind("<Next>", lambda event: self.scroll_by(self.VISIBLE_ROWS))
+
+    def apply_filter(self):
+        self.refresh_view()
+        self.first = 0
+        self.render()
+
+    def sort_by(self, column):
+        """Header click: sort by column, a second click reverses the order"""
+        if self.sort_column == column:
+            self.descending = not self.descending
+        else:
+            self.sort_column = column
+            self.descending = False
+        for position, col in enumerate(self.COLUMN_CONFIG):
+            heading = self.COLUMN_CONFIG[col][0]
+            if position == column:
+                heading += " \u25bc" if self.descending else " \u25b2"
+            self.tree.heading(col, text=heading)
+        self.refresh_view()
+        self.first = 0
+        self.render()
+
+    def refresh_view(self):
+        prefix = self.filter_var.get().strip() if self.filter_var is not None else ""
+        self.view = self.index.view(prefix, self.sort_column)
+
+    def count(self):
+        return len(self.rows) if self.view is None else len(self.view)
+
+    def row_number(self, position):
+        if self.descending:
+            position = self.count() - 1 - position
+        return position if self.view is None else self.view[position]
+
+    def max_first(self):
+        return max(0, self.count() - self.VISIBLE_ROWS)
+
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.first = int(float(amount) * self.count())
+            self.render()
+        elif action == "scroll":
+            step = self.VISIBLE_ROWS if unit == "pages" else 1
+            self.scroll_by(int(amount) * step)
+
+    def scroll_by(self, count):
+        self.first += count
+        self.render()
+        return 'break'
+
+    def render(self):
+        total = self.count()
+        self.first = min(max(self.first, 0), self.max_first())
+        window = [self.row_number(position)
+                  for position in range(self.first, min(self.first + self.VISIBLE_ROWS, total))]
+
+        # Reuse the same few items, only adding or removing at the end
+        items = self.tree.get_children()
+        for iid in items[len(window):]:
+            self.tree.delete(iid)
+        for offset, idx in enumerate(window):
+            values = (idx + 1,) + self.rows[idx][1:]
+            tag = 'evenrow' if (self.first + offset) % 2 == 0 else 'oddrow'
+            if offset < len(items):
+                self.tree.item(items[offset], values=values, tags=(tag,))
+            else:
+                self.tree.insert("", "end", values=values, tags=(tag,))
 
-        # Fourth check: Was a screenshot taken?
-        if not screenshot_taken:
-            messagebox.showwarning("Warning", "Please take a screenshot first before saving the input.")
+        if total:
+            self.vsb.set(self.first / total, (self.first + len(window)) / total)
+        else:
+            self.vsb.set(0, 1)
+        self.count_label.config(text=f"{total} of {len(self.rows)} entries")
+
+
+history_viewer = HistoryViewer(entry_store)
+
+
+class SummaryPanel:
+    """Today's totals for the selected station (all stations if none is
+    selected), read from the running DailySummary so opening or refreshing
+    it never rescans the history. Built once and hidden when closed."""
+
+    def __init__(self, summary):
+        self.summary = summary
+        self.win = None
+
+    def is_open(self):
+        return self.win is not None and self.win.state() != "withdrawn"
+
+    def show(self):
+        if self.win is None:
+            self.build()
+        else:
+            self.win.deiconify()
+            self.win.lift()
+        self.refresh()
+
+    def build(self):
+        self.win = tk.Toplevel(root)
+        self.win.title("Daily Summary")
+        self.win.geometry(f"360x330+{root.winfo_x() + 680}+{root.winfo_y()}")
+        self.win.resizable(False, False)
+        self.win.protocol("WM_DELETE_WINDOW", self.win.withdraw)
+        try:
+            self.win.iconbitmap(resource_path("assets\\dump-truck.ico"))
+        except Exception as e:
+            print(f"Icon load failed: {e}")
+
+        self.title_label = tk.Label(self.win, text="", font=('Arial', 11, 'bold'))
+        self.title_label.pack(pady=(8, 4))
+
+        totals_frame = tk.Frame(self.win)
+        totals_frame.pack(fill='x', padx=10)
+        self.values = {}
+        for row, name in enumerate(("Trucks", "Avg. weight difference", "Overweight")):
+            tk.Label(totals_frame, text=f"{name}:", font=('Arial', 10, 'bold')).grid(row=row, column=0, sticky="w")
+            self.values[name] = tk.Label(totals_frame, text="", font=('Arial', 10))
+            self.values[name].grid(row=row, column=1, sticky="w", padx=10)
+
+        self.tree = ttk.Treeview(self.win, columns=("cargo", "trucks"), show="headings", height=8)
+        self.tree.heading("cargo", text="Cargo Type")
+        self.tree.heading("trucks", text="Trucks")
+        self.tree.column("cargo", width=240)
+        self.tree.column("trucks", width=80, anchor="center")
+        self.tree.pack(fill='both', expand=True, padx=10, pady=8)
+
+    def refresh(self):
+        if not self.is_open():
             return
+        station = station_var.get()
+        date_text = date_entry.get().strip()
+        totals = self.summary.totals(station, date_text)
+        self.title_label.config(text=f"{station or 'All stations'} - {date_text}")
+        self.values["Trucks"].config(text=str(totals.trucks))
+        self.values["Avg. weight difference"].config(text=f"{totals.average_diff():+.0f} kg")
+        self.values["Overweight"].config(
+            text=str(totals.overweight) if self.summary.limits else "no axle limits set")
+        self.tree.delete(*self.tree.get_children())
+        for cargo, count in totals.top_cargo(count=len(totals.cargo)):
+            self.tree.insert("", "end", values=(cargo, count))
 
-        # If all checks pass → proceed to save
-        entry = {
-            'station': station_var.get(),
-            'date': date_entry.get(),
-            'axle_class': int(axle_class),
-            'plate_number': plate_number,
-            'cargo_type': cargo_type,
-            'ramp_bridge': int(ramp_bridge),
-            'static_scale': int(static_scale),
-            'speed': int(speed),
-            'destination': destination_var.get()
-        }
 
-        input_history.append(entry)
-        update_counter()
-        backup_input_history()
+summary_panel = SummaryPanel(engine.summary)
 
-        if len(input_history) > MAX_HISTORY:
-            input_history.pop(0)
 
-        # Clear fields for next entry
-        entry_vars['AXLE CLASS'].set('')
-        entry_vars['PLATE NUMBER'].set('')
-        entry_vars['CARGO TYPE'].set('')
-        entry_vars['RAMP BRIDGE WEIGHT'].set('')
-        entry_vars['STATIC SCALE WEIGHT'].set('')
-        entry_vars['SPEED'].set('')
+def save_data():
+    """Store input data for the session (newest 100 in memory, the rest spilled to disk)"""
+    global screenshot_taken
+    entry_vars['PLATE NUMBER'].drop_suggestion()  # F2 can arrive before the field loses focus
 
-        screenshot_taken = False
+    try:
+        values = {
+            'axle_class': entry_vars['AXLE CLASS'].get(),
+            'plate_number': entry_vars['PLATE NUMBER'].get(),
+            'cargo_type': entry_vars['CARGO TYPE'].get(),
+            'ramp_bridge': entry_vars['RAMP BRIDGE WEIGHT'].get(),
+            'static_scale': entry_vars['STATIC SCALE WEIGHT'].get(),
+            'speed': entry_vars['SPEED'].get(),
+        }
 
-        for field_key, var in entry_vars.items():
-            widget = getattr(var, "widget", None)
-            if widget:
-                if field_key == "CARGO TYPE":
-                    widget.config(state='readonly')
-                elif field_key == "WEIGHT DIFF":
-                    widget.config(state='disabled')
-                else:
-                    widget.config(state='normal')
-                    widget.configure(background="white", fg="black")
+        # Station, date and every field first, then the screenshot
+        check_required(station_var.get(), date_entry.get(), values)
+        if not screenshot_taken:
+            messagebox.showwarning("Warning", "Please take a screenshot first before saving the input.")
+            return
+
+        duplicate = engine.find_duplicate(station_var.get(), date_entry.get(), values)
+        if duplicate:
+            saved_at = datetime.fromtimestamp(duplicate[0]).strftime("%I:%M %p")
+            if not messagebox.askyesno("Possible Duplicate",
+                                       f"{values['plate_number'].strip().upper()} was already saved at {saved_at} "
+                                       f"with the same weights.\nSave it again?"):
+                return
+
+        # Time the save itself, not the dialogs above that wait for the operator
+        with metrics.timed("save_data"):
+            entry = engine.save_entry(station_var.get(), date_entry.get(), values, destination_var.get())
+            history_viewer.add(entry)
+            summary_panel.refresh()
+            update_counter()
+
+            # Clear fields for next entry
+            entry_vars['AXLE CLASS'].set('')
+            entry_vars['PLATE NUMBER'].set('')
+            entry_vars['CARGO TYPE'].set('')
+            entry_vars['RAMP BRIDGE WEIGHT'].set('')
+            entry_vars['STATIC SCALE WEIGHT'].set('')
+            entry_vars['SPEED'].set('')
+
+            screenshot_taken = False
+
+            for field_key, var in entry_vars.items():
+                widget = getattr(var, "widget", None)
+                if widget:
+                    if field_key == "CARGO TYPE":
+                        widget.config(state='readonly')
+                    elif field_key == "WEIGHT DIFF":
+                        widget.config(state='disabled')
+                    else:
+                        widget.config(state='normal')
+                        widget.configure(background="white", fg="black")
                     
-        setup_readonly_keyboard_filter(cargo_dropdown, cargo_types)
+            setup_readonly_keyboard_filter(cargo_dropdown, cargo_index)
 
-        # After successful save, reset screenshot flag
-        screenshot_taken = False
+            # After successful save, reset screenshot flag
+            screenshot_taken = False
 
-        status_label.config(text=f"Success! Input stored in memory", bg="skyblue", fg="black")
-        root.after(3000, lambda: status_label.config(text="Ready", bg="green", fg="white"))
+            status_label.config(text=f"Success! Input stored in memory", bg="skyblue", fg="black")
+            root.after(3000, lambda: status_label.config(text="Ready", bg="green", fg="white"))
 
+    except ValidationError as e:
+        messagebox.showwarning("Warning", str(e))
     except ValueError:
         messagebox.showerror("Error", "Numeric fields must contain valid numbers")
     except Exception as e:
@@ -151,112 +574,118 @@ def save_data():
 
 def print_data():
     """Save all stored inputs to Excel using the template when button is pressed"""
+    global export_job, export_saving
+    if export_job is not None and export_job.running:
+        if export_saving:
+            messagebox.showinfo("Export Running", "The file is being saved and can no longer be cancelled.")
+            return
+        if messagebox.askyesno("Export Running", "An Excel export is still running.\nDo you want to cancel it?"):
+            export_job.cancel()
+        return
+
     if not input_history:
         messagebox.showwarning("Warning", "No data to save")
         return
         
     try:
-        station_short_mapping = {
-            "D STATION NO. 1": "D-1",
-            "D STATION NO. 2": "D-2",
-            "NR STATION NO. 1": "NR1",
-            "NR STATION NO. 2": "NR2",
-            "NR STATION NO. 3": "NR3",
-            "S STATION NO. 1": "S1",
-            "S STATION NO. 2": "S2",
-            "S STATION NO. 3": "S3",
-            "S STATION NO. 4": "S4",
-            "S STATION NO. 5": "S5",
-            "S STATION NO. 6": "S6",
-        }
-        
-        selected_station_full = station_var.get()
-        station_short = station_short_mapping.get(selected_station_full, "STATION")
-        
         # Show save file dialog
         file_path = filedialog.asksaveasfilename(
             defaultextension=".xlsx",
-            filetypes=[("Excel files", "*.xlsx")],
+            filetypes=export_file_types(),
             title="Save Excel File As",
-            initialfile=f"RAMP & STATIC {station_short} {datetime.now().strftime('%B %d, %Y')}.xlsx"
+            initialfile=export_file_name(station_var.get(), datetime.now().strftime('%B %d, %Y'))
             )  
         
         if not file_path:  # User cancelled
             return
 
-        # Load the template workbook
-        template_workbook = openpyxl.load_workbook(excel_path)
-        template_sheet = template_workbook.active
-        
-        # Update A1 with station name from dropdown
-        selected_station = station_var.get()
-        if selected_station:
-            template_sheet['A1'] = f"{selected_station} WEIGH STATION"
-        else:
-            template_sheet['A1'] = "WEIGH STATION"
-
-        # Write each entry to specific cells in the template
-        for i, entry in enumerate(input_history):
-            # Convert numeric values to integers
-            try:
-                axle_class = int(entry['axle_class'])
-                plate_number = entry['plate_number']
-                ramp_bridge = int(entry['ramp_bridge'])
-                static_scale = int(entry['static_scale'])
-                speed = int(entry['speed'])
-            except (ValueError, TypeError):
-                messagebox.showerror("Error", "Invalid numeric values in data")
-                return
-
-            # For first entry, use the template positions
-            if i == 0:
-                template_sheet['B2'] = entry['date']
-                template_sheet['B8'] = axle_class
-                template_sheet['C8'] = plate_number
-                template_sheet['D8'] = entry['cargo_type']
-                template_sheet['E8'] = ramp_bridge
-                template_sheet['F8'] = static_scale
-                template_sheet['H8'] = speed
-            else:
-                # For additional entries, find next empty row
-                next_row = 9
-                while template_sheet[f'B{next_row}'].value is not None:
-                    next_row += 1
-                
-                # Write data to next available row as numbers
-                template_sheet[f'B{next_row}'] = axle_class
-                template_sheet[f'C{next_row}'] = plate_number
-                template_sheet[f'D{next_row}'] = entry['cargo_type']
-                template_sheet[f'E{next_row}'] = ramp_bridge
-                template_sheet[f'F{next_row}'] = static_scale
-                template_sheet[f'H{next_row}'] = speed
-
-        # Save to user-selected location
-        template_workbook.save(file_path)
-        messagebox.showinfo("Success", f"Saved {len(input_history)} entries to:\n{file_path}")
-
-        input_history.clear()
-        update_counter()
-
-        autosave_path = os.path.join(os.path.abspath("."), "backups", "autosave_input_history.json")
-        if os.path.exists(autosave_path):
-            os.remove(autosave_path)
-
-        station_dropdown.config(state="readonly")
-        station_var.set('')  # Clear selected station
-        confirm_button.config(text="Confirm", command=confirm_action)
-
-        date_entry.delete(0, tk.END)  # Clear the date
-        destination_var.set('')
+        # Time from here on: the dialog above waits for the operator
+        with metrics.timed("print_data") as m:
+            # Snapshot the entries so the operator can keep saving trucks meanwhile
+            entries = list(input_history)
+            m["rows"] = len(entries)
+            selected_station = station_var.get()
+
+            def work(job):
+                # Runs on the worker thread: no Tk calls in here
+                def progress(done, total):
+                    job.report("Writing rows" if done < total else "Saving workbook", done, total)
+                return engine.export(file_path, selected_station, entries, progress=progress, cancel=job.cancelled)
+
+            export_job = BackgroundJob(root.after, work,
+                                       on_done=lambda count: finish_export(entries, file_path),
+                                       on_error=export_failed,
+                                       on_progress=show_export_progress)
+            export_saving = False
+            excel_button.config(text=" Cancel Export")
+            status_label.config(text=f"Exporting {len(entries)} entries...", bg="skyblue", fg="black")
+            export_job.start()
 
-        status_label.config(text="Ready", bg="green", fg="white")
-        
-    except PermissionError:
-        messagebox.showerror("Error", "Please close the template Excel file before saving")
     except Exception as e:
         messagebox.showerror("Error", f"Failed to save data:\n{str(e)}")
 
-def setup_readonly_keyboard_filter(combobox, valid_list):
+def export_file_types():
+    """The Excel template first; plain-data formats for the back office after it"""
+    file_types = [("Excel files", "*.xlsx"), ("CSV files", "*.csv")]
+    if find_spec("pyarrow") is not None:
+        file_types.append(("Parquet files", "*.parquet"))
+    if find_spec("numpy") is not None:
+        file_types.append(("NumPy arrays", "*.npz"))
+    return file_types
+
+def show_export_progress(stage, done, total):
+    global export_saving
+    if done >= total:
+        export_saving = True
+        excel_button.config(text=" Saving...")
+    status_label.config(text=f"{stage}... {done}/{total}", bg="skyblue", fg="black")
+
+def finish_export(entries, file_path):
+    """Called on the Tk thread once the worker has saved the workbook"""
+    excel_button.config(text=" Save Excel")
+    note = "\n\nThe file was already being saved when the export was cancelled." if export_job.cancelled.is_set() else ""
+    messagebox.showinfo("Success", f"Saved {len(entries)} entries to:\n{file_path}{note}")
+
+    if is_table_path(file_path):
+        # A side copy for other tools: the entries stay queued for the Excel template
+        status_label.config(text=f"Table saved, {len(input_history)} entries still to export to Excel", bg="skyblue", fg="black")
+        root.after(3000, lambda: status_label.config(text="Ready", bg="green", fg="white"))
+        return
+
+    # Drop only what was exported; trucks saved during the export stay queued
+    exported_ids = engine.finish_export(entries, file_path)
+    history_viewer.mark_exported(exported_ids)
+    update_counter()
+
+    if input_history:
+        status_label.config(text=f"Export done, {len(input_history)} new entries not exported yet", bg="skyblue", fg="black")
+        root.after(3000, lambda: status_label.config(text="Ready", bg="green", fg="white"))
+        return
+
+    station_dropdown.config(state="readonly")
+    station_var.set('')  # Clear selected station
+    confirm_button.config(text="Confirm", command=confirm_action)
+
+    date_entry.delete(0, tk.END)  # Clear the date
+    destination_var.set('')
+
+    status_label.config(text="Ready", bg="green", fg="white")
+
+def export_failed(error):
+    excel_button.config(text=" Save Excel")
+    status_label.config(text="Ready", bg="green", fg="white")
+    if isinstance(error, ExportCancelled):
+        status_label.config(text="Export cancelled", bg="skyblue", fg="black")
+        root.after(3000, lambda: status_label.config(text="Ready", bg="green", fg="white"))
+    elif isinstance(error, PermissionError):
+        messagebox.showerror("Error", "Please close the template Excel file before saving")
+    elif isinstance(error, (ValueError, TypeError)):
+        messagebox.showerror("Error", "Invalid numeric values in data")
+    else:
+        messagebox.showerror("Error", f"Failed to save data:\n{str(error)}")
+
+def setup_readonly_keyboard_filter(combobox, index):
+    """Type-to-select for a readonly combobox, matching against a CompletionIndex"""
     typed_chars = {"text": ""}
 
     def on_key(event):
@@ -267,9 +696,9 @@ def setup_readonly_keyboard_filter(combobox, valid_list):
         else:
             return
 
-        matches = [item for item in valid_list if item.lower().startswith(typed_chars["text"].lower())]
-        if matches:
-            combobox.set(matches[0])
+        match = index.first(typed_chars["text"])
+        if match:
+            combobox.set(match)
 
     def reset_typed_chars(event):
         typed_chars["text"] = ""
@@ -279,11 +708,6 @@ def setup_readonly_keyboard_filter(combobox, valid_list):
 
 
 
-def validate_integer(new_value):
-    if new_value == "":
-        return True
-    return new_value.isdigit()
-
 def disable_tab(event):
     return 'break'
 
@@ -337,99 +761,20 @@ def browse_folder():
         destination_var.set(folder_selected)
 
 def view_history_window():
-    if not input_history:
-        messagebox.showinfo("History", "No history available.")
-        return
-
-    history_win = tk.Toplevel(root)
-    history_win.title("Input History")
-    screen_width = history_win.winfo_screenwidth()
-    screen_height = history_win.winfo_screenheight()
-    x = (screen_width / 2) - (700 / 2)
-    y = (screen_height / 2) - (400 / 2)
-    history_win.geometry(f"700x400+{int(x)}+{int(y)}")
-    history_win.resizable(False, False)
-
-    icon_path = resource_path("assets\\dump-truck.ico")
-    try:
-        history_win.iconbitmap(icon_path)
-    except Exception as e:
-        print(f"Icon load failed: {e}")
+    with metrics.timed("view_history_window") as m:
+        history_viewer.show()
+        m["rows"] = len(history_viewer.rows or ())
 
-    # Display names and column widths
-    column_config = {
-        "#": ("#", 40),
-        "axle_class": ("Axle Class", 80),
-        "plate_number": ("Plate Number", 120),
-        "cargo_type": ("Cargo Type", 150),
-        "ramp_bridge": ("Ramp Weight", 100),
-        "static_scale": ("Static Weight", 100),
-        "speed": ("Speed", 80),
-    }
-
-    columns = ["#"] + [k for k in input_history[0].keys() if k not in ("station", "date", "destination")]
-
-    # Treeview styling
-    style = ttk.Style()
-    style.configure("History.Treeview",
-                    background="white",
-                    foreground="black",
-                    rowheight=25,
-                    fieldbackground="white",
-                    font=('Arial', 10))
-    style.configure("History.Treeview.Heading",
-                    background="lightgray",
-                    foreground="black",
-                    font=('Arial', 10, 'bold'),
-                    relief="raised")
-    style.map("History.Treeview",
-              background=[("selected", "#d0e0ff")],
-              foreground=[("selected", "black")])
-
-    # Frame for Treeview + scrollbars
-    tree_frame = tk.Frame(history_win)
-    tree_frame.pack(fill='both', expand=True)
-
-    vsb = ttk.Scrollbar(tree_frame, orient="vertical")
-    vsb.pack(side="right", fill="y")
-
-    hsb = ttk.Scrollbar(tree_frame, orient="horizontal")
-    hsb.pack(side="bottom", fill="x")
-
-    tree = ttk.Treeview(tree_frame, columns=columns, show='headings',
-                        yscrollcommand=vsb.set, xscrollcommand=hsb.set,
-                        style="History.Treeview")
-    tree.pack(fill='both', expand=True)
-
-    vsb.config(command=tree.yview)
-    hsb.config(command=tree.xview)
-
-    for col in columns:
-        heading, width = column_config.get(col, (col.title(), 100))
-        tree.heading(col, text=heading, anchor="center")
-        tree.column(col, width=width, anchor="center")
-
-    tree.tag_configure('oddrow', background='#f0f0f0')
-    tree.tag_configure('evenrow', background='white')
-
-    for idx, entry in enumerate(input_history):
-        row = [idx + 1] + [entry.get(col, "") for col in columns[1:]]
-        tag = 'evenrow' if idx % 2 == 0 else 'oddrow'
-        tree.insert("", "end", values=row, tags=(tag,))
-
-
-def validate_axle_class_input(P):
-    if P == "":
-        return True  # Allow clearing the field
-    if P.isdigit() and len(P) <= 2:
-        return True
-    return False
 
 def station_selected():
     station_dropdown.config(state='disabled')
 
 def take_screenshot():
     global screenshot_taken
+    entry_vars['PLATE NUMBER'].drop_suggestion()  # Name the file after what was typed
+    if screenshot_job is not None and screenshot_job.running:
+        return  # Previous capture is still being written
+
     if screenshot_taken:
         response = messagebox.askyesno("Warning", 
                                      "A screenshot has already been taken for this input.\n"
@@ -449,83 +794,66 @@ def take_screenshot():
         return
 
     try:
-        # Create the overlay window
-        overlay = tk.Toplevel(root)
-        overlay.overrideredirect(True)
-        overlay.geometry(f"{root.winfo_screenwidth()}x{root.winfo_screenheight()}+0+0")
-        overlay.configure(bg='black')
-        overlay.attributes('-alpha', 0.0)  # Start fully transparent
-        overlay.lift()
+        with metrics.timed("take_screenshot"):
+            # Lock the fields while the capture is in flight
+            for field_key, var in entry_vars.items():
+                widget = getattr(var, "widget", None)
+                if widget:
+                    widget.config(state='disabled')
+            screenshot_button.config(state='disabled')
 
-        do_screenshot()
-
-        for field_key, var in entry_vars.items():
-            widget = getattr(var, "widget", None)
-            if widget:
-                if field_key == "CARGO TYPE":
-                    widget.config(state='readonly')  # Keep usable for keyboard typing
-                elif field_key == "WEIGHT DIFF":
-                    widget.config(state='disabled')  # Always disabled (computed)
-                else:
-                    widget.config(state='normal')
+            # Hide the app and give the window manager time to repaint, without sleeping on the UI thread
+            root.withdraw()
+            root.after(200, lambda: do_screenshot(dest_folder, station_var.get(), plate_number))
 
     except Exception as e:
+        restore_input_fields()
         messagebox.showerror("Error", f"An error occurred:\n{e}")
 
-def do_screenshot():
-    station_folder_mapping = {
-    "D STATION NO. 1": "SAMPLE D-1",
-    "D STATION NO. 2": "SAMPLE D-2",
-    "NR STATION NO. 1": "SAMPLE NR1",
-    "NR STATION NO. 2": "SAMPLE NR2",
-    "NR STATION NO. 3": "SAMPLE NR3",
-    "S STATION NO. 1": "SAMPLE S1",
-    "S STATION NO. 2": "SAMPLE S2",
-    "S STATION NO. 3": "SAMPLE S3",
-    "S STATION NO. 4": "SAMPLE S4",
-    "S STATION NO. 5": "SAMPLE S5",
-    "S STATION NO. 6": "SAMPLE S6"
-    }
+@metrics.measure()
+def do_screenshot(dest_folder, station_name, plate_number):
+    """Grab the screen on the Tk thread, then encode and write it on a worker thread"""
+    global screenshot_job
     try:
-        root.withdraw()
-        time.sleep(0.2)
-        screenshot = ImageGrab.grab()
-        dest_folder = destination_var.get()
-        station_name = station_var.get()
-        folder_name = station_folder_mapping.get(station_name, "SAMPLE")  # Default to SAMPLE if not found
-        screenshot_folder = os.path.join(dest_folder, folder_name)
-        os.makedirs(screenshot_folder, exist_ok=True)
-
-        plate_number = entry_vars['PLATE NUMBER'].get().strip()
-        safe_plate_number = "".join(c for c in plate_number if c.isalnum())
-
-        screenshot_filename = f"{safe_plate_number}.jpeg"
-        screenshot_path = os.path.join(screenshot_folder, screenshot_filename)
-
-        count = 1
-        while os.path.exists(screenshot_path):
-            screenshot_filename = f"{safe_plate_number}({count}).jpeg"
-            screenshot_path = os.path.join(screenshot_folder, screenshot_filename)
-            count += 1
-
-        screenshot = screenshot.convert("RGB")
-        screenshot.save(screenshot_path, "JPEG")
-        status_label.config(text=f"Success, Screenshot saved as: {screenshot_filename}", bg="lightgreen", fg="black")
-        root.after(3000, lambda: status_label.config(text="Complete all the details and Save Input", bg="green", fg="white"))
-
-        global screenshot_taken
-        screenshot_taken = True             
-
-        for field_key, var in entry_vars.items():
-            widget = getattr(var, "widget", None)
-            if widget:
-                widget.config(state='disabled')
-
+        profile = capture_settings.profile_for(station_name)
+        screenshot = capture.grab(profile)
     except Exception as e:
-        messagebox.showerror("Error", f"An error occurred:\n{e}")
+        screenshot_failed(e)
+        return
     finally:
         root.deiconify()
 
+    screenshot_job = BackgroundJob(root.after,
+                                   lambda job: engine.save_screenshot(screenshot, dest_folder, station_name,
+                                                                      plate_number, profile),
+                                   on_done=screenshot_saved,
+                                   on_error=screenshot_failed)
+    screenshot_job.start()
+
+def screenshot_saved(result):
+    global screenshot_taken
+    screenshot_filename, size, encode_ms = result
+    screenshot_taken = True
+    restore_input_fields()
+    status_label.config(text=f"Success, Screenshot saved as: {screenshot_filename} ({size // 1024} KB, {encode_ms:.0f} ms)", bg="lightgreen", fg="black")
+    root.after(3000, lambda: status_label.config(text="Complete all the details and Save Input", bg="green", fg="white"))
+
+def screenshot_failed(error):
+    restore_input_fields()
+    messagebox.showerror("Error", f"An error occurred:\n{error}")
+
+def restore_input_fields():
+    screenshot_button.config(state='normal')
+    for field_key, var in entry_vars.items():
+        widget = getattr(var, "widget", None)
+        if widget:
+            if field_key == "CARGO TYPE":
+                widget.config(state='readonly')  # Keep usable for keyboard typing
+            elif field_key == "WEIGHT DIFF":
+                widget.config(state='disabled')  # Always disabled (computed)
+            else:
+                widget.config(state='normal')
+
 def update_weight_diff(*args):
     """Calculate and update weight difference automatically"""
     try:
@@ -560,24 +888,6 @@ def update_counter():
 
     flash()
 
-def backup_input_history():
-    try:
-        backup_dir = os.path.join(os.path.abspath("."), "backups")
-        os.makedirs(backup_dir, exist_ok=True)
-        autosave_path = os.path.join(backup_dir, "autosave_input_history.json")
-        with open(autosave_path, "w") as f:
-            json.dump(input_history, f)
-    except Exception as e:
-        print(f"Failed to autosave input history: {e}")
-
-
-def validate_plate_number(P):
-    """Allow letters, numbers, and spaces"""
-    if P == "":
-        return True  # Allow clearing
-    return all(c.isalnum() or c.isspace() for c in P)
-
-
 # Create main window
 root = tk.Tk()
 root.title("Weigh Station Comparison v1.2")
@@ -623,22 +933,13 @@ station_label = tk.Label(first_row, text="CHOOSE STATION :", font=('Arial', 12,
 station_label.grid(row=0, column=0, padx=5, sticky="w")
 
 station_var = tk.StringVar()
-station_dropdown = ttk.Combobox(first_row, textvariable=station_var, values=[
-    "D STATION NO. 1", "D STATION NO. 2",
-    "NR STATION NO. 1", "NR STATION NO. 2", "NR STATION NO. 3",
-    "S STATION NO. 1", "S STATION NO. 2", "S STATION NO. 3",
-    "S STATION NO. 4", "S STATION NO. 5", "S STATION NO. 6",
-], width=27, state='readonly')
+station_dropdown = ttk.Combobox(first_row, textvariable=station_var, values=STATIONS, width=27, state='readonly')
 station_dropdown.bind('<<ComboboxSelected>>')
 station_dropdown.grid(row=0, column=1, padx=5, sticky="w")
+setup_readonly_keyboard_filter(station_dropdown, CompletionIndex(STATIONS))
 
-# Confirm icon
-confirm_img = Image.open(confirm_icon_path).resize((15, 15), Image.LANCZOS)
-confirm_photo = ImageTk.PhotoImage(confirm_img)
-
-# Revert icon
-revert_img = Image.open(revert_icon_path).resize((15, 15), Image.LANCZOS)
-revert_photo = ImageTk.PhotoImage(revert_img)
+confirm_photo = load_icon("check.png", 15)
+revert_photo = load_icon("revert.png", 15)
 
 confirm_button = tk.Button(first_row, image=confirm_photo, command=confirm_action, width=17, height=17)
 confirm_button.image = confirm_photo
@@ -654,7 +955,8 @@ date_label = tk.Label(second_row, text="Date:", font=('Arial', 10, 'bold'))
 date_label.grid(row=0, column=0, padx=5, sticky="w")
 
 # --- Date Entry (pre-filled with system date, initially read-only) ---
-date_entry = tk.Entry(second_row, width=17)
+date_var = tk.StringVar()
+date_entry = tk.Entry(second_row, textvariable=date_var, width=17)
 date_entry.grid(row=0, column=1, padx=5, sticky="w")
 date_entry.insert(0, datetime.now().strftime("%B %d, %Y"))
 date_entry.config(state='readonly')
@@ -700,9 +1002,7 @@ destination_var = tk.StringVar()
 destination_entry = tk.Entry(second_row, state="readonly", textvariable=destination_var, width=20)
 destination_entry.grid(row=0, column=4, padx=5, pady=2, sticky="w")
 
-browse_image = Image.open(browse_icon_path)
-browse_image = browse_image.resize((20, 20), Image.LANCZOS)
-browse_photo = ImageTk.PhotoImage(browse_image)
+browse_photo = load_icon("open-folder.png", 20)
 
 browse_button = tk.Button(second_row, image=browse_photo, compound="left", text=" Browse", width=70, command=browse_folder)
 browse_button.grid(row=0, column=5, padx=5, pady=2, sticky="w")
@@ -723,19 +1023,19 @@ fields = [
 
 entry_vars = {}
 
-def setup_autocomplete_combobox(combobox, valid_list):
+def setup_autocomplete_combobox(combobox, index):
     last_valid = {"value": ""}
 
     def on_keyrelease(event):
-        value = combobox.get().strip().lower()
-        matches = [item for item in valid_list if item.lower().startswith(value)]
-        if matches:
-            combobox.set(matches[0])
+        value = combobox.get().strip()
+        match = index.first(value)
+        if match:
+            combobox.set(match)
             combobox.icursor(len(value))  # Keep user's typed cursor position
 
     def on_focusout(event):
         value = combobox.get().strip()
-        if value not in valid_list:
+        if value not in index:
             messagebox.showwarning("Invalid Entry", f"'{value}' is not a valid option.")
             combobox.set(last_valid["value"])
         else:
@@ -746,10 +1046,79 @@ def setup_autocomplete_combobox(combobox, valid_list):
     combobox.bind("<Return>", on_focusout)
 
 
+def setup_plate_autocomplete(entry, var):
+    """Complete plate numbers seen before; Up/Down cycle through the ranked matches.
+
+    A suggestion is only kept once accepted with Right or End; leaving the
+    field, taking a screenshot or saving otherwise goes back to what was
+    typed (var.drop_suggestion()).
+    """
+    state = {"typed": "", "matches": [], "pos": 0, "shown": None}
+
+    def show_match(pos):
+        state["pos"] = pos
+        typed = state["typed"]
+        state["shown"] = state["matches"][pos]
+        var.set(state["shown"])
+        entry.icursor(len(typed))
+        entry.select_range(len(typed), tk.END)
+
+    def on_keyrelease(event):
+        if event.keysym in ("Up", "Down"):
+            if state["matches"]:
+                step = 1 if event.keysym == "Down" else -1
+                show_match((state["pos"] + step) % len(state["matches"]))
+            return
+        if event.keysym in ("Right", "End"):
+            state["shown"] = None  # Suggestion accepted
+            return
+        if not (len(event.char) == 1 and event.char.isalnum()):
+            return  # Only complete after typing, not after deleting or moving
+        text = entry.get()
+        if entry.index(tk.INSERT) != len(text):
+            return
+        state["typed"] = text
+        state["shown"] = None
+        if plate_directory.lookup(text.upper()):
+            state["matches"] = []  # Already a known plate; don't turn ABC12 into ABC123
+            return
+        state["matches"] = plate_directory.suggest(text.upper())
+        if state["matches"]:
+            show_match(0)
+
+    def drop_suggestion():
+        if state["shown"] is not None and var.get() == state["shown"]:
+            var.set(state["typed"])  # Suggestion not accepted
+        state["shown"] = None
+
+    def on_focusout(event):
+        drop_suggestion()
+        # Pre-fill what this truck carried last time, without overwriting anything typed
+        known = plate_directory.lookup(var.get().strip().upper())
+        if not known:
+            return
+        axle_class, cargo_type = known
+        if axle_class is not None and not entry_vars['AXLE CLASS'].get():
+            entry_vars['AXLE CLASS'].set(str(axle_class))
+        if cargo_type in cargo_index and not entry_vars['CARGO TYPE'].get():
+            entry_vars['CARGO TYPE'].set(cargo_type)
+
+    entry.bind("<KeyRelease>", on_keyrelease)
+    entry.bind("<FocusOut>", on_focusout)
+    var.drop_suggestion = drop_suggestion
+
+
 vcmd = root.register(validate_integer)
 vcmd2 = root.register(validate_axle_class_input)
 vcmd_plate = root.register(validate_plate_number)
 
+# Cargo types come from data/cargo_types.txt (one per line) when it exists
+cargo_types = load_vocabulary(resource_path("data\\cargo_types.txt"), [
+    "SAND", "SEWAGE WATER", "CEMENT", "DRINKING WATER", "OIL AND GAS", "OTHERS",
+    "READYMIX CEMENT", "AGRICULTURAL PRODUCTS", "ASPHALT", "BLOCKS",
+    "STEEL", "LIVE STOCKS", "CONSTRUCTION DEBRIS", "STONE"])
+cargo_index = CompletionIndex(cargo_types)
+
 for idx, (label_text, field_key, field_width) in enumerate(fields):
     mini_frame = tk.Frame(fields_frame)
     mini_frame.grid(row=0, column=idx, padx=2, pady=2)
@@ -758,16 +1127,13 @@ for idx, (label_text, field_key, field_width) in enumerate(fields):
     lbl.pack()
 
     var = tk.StringVar()
-    cargo_types = ["SAND", "SEWAGE WATER", "CEMENT", "DRINKING WATER", "OIL AND GAS", "OTHERS", 
-                  "READYMIX CEMENT", "AGRICULTURAL PRODUCTS", "ASPHALT", "BLOCKS",
-                  "STEEL", "LIVE STOCKS", "CONSTRUCTION DEBRIS", "STONE"]
-    
+
     if field_key == "CARGO TYPE":
         cargo_dropdown = ttk.Combobox(mini_frame, textvariable=var, values=cargo_types, width=field_width, state="readonly")
         cargo_dropdown.pack()
         entry_vars[field_key] = var  # ✅ Add to entry_vars first
         entry_vars[field_key].widget = cargo_dropdown  # ✅ Now safe to attach widget reference
-        setup_readonly_keyboard_filter(cargo_dropdown, cargo_types)
+        setup_readonly_keyboard_filter(cargo_dropdown, cargo_index)
     elif field_key == "WEIGHT DIFF":
         entry = tk.Entry(mini_frame, textvariable=var, width=field_width, state="disabled", justify="center")
         entry.bind("<Tab>", disable_tab)
@@ -782,6 +1148,7 @@ for idx, (label_text, field_key, field_width) in enumerate(fields):
     elif field_key == "PLATE NUMBER":
         entry = tk.Entry(mini_frame, textvariable=var, justify="center", width=field_width, validate='key', validatecommand=(vcmd_plate, '%P'))
         entry.pack()
+        setup_plate_autocomplete(entry, var)
     else:
         entry = tk.Entry(mini_frame, textvariable=var, justify="center", width=field_width, validate='key', validatecommand=(vcmd, '%P'))
         entry.pack()
@@ -796,44 +1163,28 @@ entry_vars['STATIC SCALE WEIGHT'].trace_add('write', update_weight_diff)
 fifth_row = tk.Frame(main_frame)
 fifth_row.pack(pady=7)
 
-# Load icons and create buttons (using your existing resource_path function)
-confirm_img = Image.open(confirm_icon_path).resize((15, 15), Image.LANCZOS)
-confirm_photo = ImageTk.PhotoImage(confirm_img)
-
-revert_img = Image.open(revert_icon_path).resize((15, 15), Image.LANCZOS)
-revert_photo = ImageTk.PhotoImage(revert_img)
-
-reset_image = Image.open(reset_icon_path)
-reset_image = reset_image.resize((20, 20), Image.LANCZOS)
-reset_photo = ImageTk.PhotoImage(reset_image)
+# Load icons and create buttons
+reset_photo = load_icon("reset.png", 20)
 
 reset_button = tk.Button(fifth_row, text=" Clear Input", image=reset_photo, compound="left", width=90, command=reset)
 reset_button.grid(row=0, column=2, padx=5)
 
-camera_image = Image.open(camera_icon_path)
-camera_image = camera_image.resize((20, 20), Image.LANCZOS)
-camera_photo = ImageTk.PhotoImage(camera_image)
+camera_photo = load_icon("camera.png", 20)
 
 screenshot_button = tk.Button(fifth_row, text=" Screenshot", image=camera_photo, compound="left", width=90, command=take_screenshot)
 screenshot_button.grid(row=0, column=0, padx=5)
 
-save_image = Image.open(save_icon_path)
-save_image = save_image.resize((20, 20), Image.LANCZOS)
-save_photo = ImageTk.PhotoImage(save_image)
+save_photo = load_icon("save.png", 20)
 
 save_button = tk.Button(fifth_row, text=" Save Input", image=save_photo, compound="left", width=90, command=save_data)
 save_button.grid(row=0, column=1, padx=5)
 
-excel_image = Image.open(excel_icon_path)
-excel_image = excel_image.resize((20, 20), Image.LANCZOS)
-excel_photo = ImageTk.PhotoImage(excel_image)
+excel_photo = load_icon("excel.png", 20)
 
 excel_button = tk.Button(fifth_row, text=" Save Excel", image=excel_photo, compound="left", width=90, command=print_data)
 excel_button.grid(row=0, column=3, padx=5)
 
-history_image = Image.open(view_history_icon_path)
-history_image = history_image.resize((20, 20), Image.LANCZOS)
-history_photo = ImageTk.PhotoImage(history_image)
+history_photo = load_icon("clock.png", 20)
 
 view_history_button = tk.Button(fifth_row, text=" View History", image=history_photo, compound="left", width=100, command=view_history_window)
 view_history_button.grid(row=0, column=4, padx=5)
@@ -849,34 +1200,99 @@ root.bind("<F1>", lambda event: screenshot_button.invoke())
 root.bind("<F2>", lambda event: save_button.invoke())
 root.bind("<F3>", lambda event: excel_button.invoke())
 root.bind("<F4>", lambda event: view_history_button.invoke())
+root.bind("<F5>", lambda event: summary_panel.show())
 root.bind("<Control-s>", lambda event: save_button.invoke())
 
 
 # ---- Counter Label ----
 counter_label = tk.Label(fifth_row, text="Inputs: 00", font=("Arial", 10, "bold"), fg="blue")
 counter_label.grid(row=0, column=5, padx=5)
+counter_label.bind("<Button-1>", lambda event: summary_panel.show())
+# Follow the station and date the operator is working on
+station_var.trace_add('write', lambda *args: summary_panel.refresh())
+date_var.trace_add('write', lambda *args: summary_panel.refresh())
+ToolTip(counter_label, "Daily summary: F5")
 
 # ---- Status Bar ----
 status_frame = tk.Frame(root)
 status_frame.pack(fill='x', side='bottom')
 
+# Debug overlay: latency of the last timed action (F12 or WEIGHSTATION_DEBUG=1)
+debug_label = tk.Label(status_frame, text="", bg='black', fg='lime', padx=5, font=("Consolas", 9))
+debug_overlay = {"after_id": None, "last": None}
+
+def refresh_debug_overlay():
+    # Polled because worker threads record metrics too and may not touch Tk
+    record = metrics.last
+    if record is not debug_overlay["last"]:
+        debug_overlay["last"] = record
+        debug_label.config(text=describe(record))
+    debug_overlay["after_id"] = root.after(250, refresh_debug_overlay)
+
+def toggle_debug_overlay(event=None):
+    if debug_overlay["after_id"] is None:
+        debug_label.pack(side='right', before=status_label)
+        refresh_debug_overlay()
+    else:
+        root.after_cancel(debug_overlay["after_id"])
+        debug_overlay["after_id"] = None
+        debug_label.pack_forget()
+
 status_label = tk.Label(status_frame, text="Ready", bg='green', fg='white', anchor='center', padx=5, font=("Arial", 10))
 status_label.pack(fill='x', side='bottom')
 
-# --- Recover from crash if autosave exists ---
-backup_dir = os.path.join(os.path.abspath("."), "backups")
-autosave_path = os.path.join(backup_dir, "autosave_input_history.json")
-
-if os.path.exists(autosave_path):
-    try:
-        with open(autosave_path, "r") as f:
-            recovered_data = json.load(f)
-        if recovered_data:
-            restore = messagebox.askyesno("Recover Inputs", f"{len(recovered_data)} unsaved entries found. Recover them?")
-            if restore:
-                input_history.extend(recovered_data)
-                update_counter()
-
+root.bind("<F12>", toggle_debug_overlay)
+if os.environ.get("WEIGHSTATION_DEBUG"):
+    toggle_debug_overlay()
+
+# --- Live scale readings (scale.json) ---
+SCALE_FIELDS = {"ramp_bridge": ("RAMP BRIDGE WEIGHT", "Ramp bridge"),
+                "static_scale": ("STATIC SCALE WEIGHT", "Static scale")}
+scale_errors = {}
+
+def poll_scales():
+    """Move settled weights from the scale threads into the weight entries"""
+    for kind, field, value in scale_ingest.poll():
+        entry_key, scale_name = SCALE_FIELDS.get(field, (None, field))
+        if kind == "reading" and entry_key:
+            entry_vars[entry_key].set(str(value))
+            status_label.config(text=f"{scale_name}: {value} kg", bg="lightgreen", fg="black")
+            root.after(3000, lambda: status_label.config(text="Ready", bg="green", fg="white"))
+        elif kind == "connected":
+            scale_errors.pop(field, None)
+        elif kind == "error" and field not in scale_errors:
+            # Reconnects are retried quietly; only say so once per outage
+            scale_errors[field] = value
+            print(f"Scale connection failed: {value}")
+            status_label.config(text=f"{scale_name} not connected, type the weight by hand", bg="orange", fg="black")
+    root.after(100, poll_scales)
+
+if scale_ingest is not None:
+    scale_ingest.start()
+    poll_scales()
+
+# --- Recover from crash if autosave exists (snapshot + journal replay) ---
+try:
+    recovered_data = engine.recover()
+    if recovered_data:
+        restore = messagebox.askyesno("Recover Inputs", f"{len(recovered_data)} unsaved entries found. Recover them?")
+        if restore:
+            duplicates = engine.recovered_duplicates(recovered_data)
+            if duplicates and not messagebox.askyesno(
+                    "Possible Duplicates",
+                    f"{len(duplicates)} of them repeat a truck saved just before with the same weights.\n"
+                    f"Remove the extra copies?"):
+                duplicates = []
+            engine.restore(recovered_data, drop=duplicates)
+            dropped = {id(entry) for entry in duplicates}  # by identity, as engine.restore() does
+            recovered_data = [entry for entry in recovered_data if id(entry) not in dropped]
+            update_counter()
+
+            if not recovered_data:
+                # Every recovered entry was a repeat; there is no session to resume
+                status_label.config(text="Removed the repeated entries, nothing left to recover", bg="skyblue", fg="black")
+                root.after(3000, lambda: status_label.config(text="Ready", bg="green", fg="white"))
+            else:
                 # Set station and date based on the first recovered entry
                 first_entry = recovered_data[0]
                 station_var.set(first_entry.get("station", ""))
@@ -886,12 +1302,23 @@ if os.path.exists(autosave_path):
 
                 # Lock station selection as if "Confirm" was pressed
                 confirm_action()
+        else:
+            engine.discard_recovered()
 
-    except Exception as e:
-        print(f"Failed to recover autosave: {e}")
+except Exception as e:
+    print(f"Failed to recover autosave: {e}")
 
 def on_exit():
-    if messagebox.askokcancel("Exit", "Are you sure you want to exit the application?"):
+    message = "Are you sure you want to exit the application?"
+    if export_job is not None and export_job.running:
+        message = "An Excel export is still running and will be lost.\n" + message
+    if messagebox.askokcancel("Exit", message):
+        if scale_ingest is not None:
+            scale_ingest.stop()
+        try:
+            engine.close()
+        except Exception as e:
+            print(f"Failed to save plate directory: {e}")
         root.destroy()
 
 root.protocol("WM_DELETE_WINDOW", on_exit)
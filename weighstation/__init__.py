@@ -0,0 +1,14 @@
+"""Core of the Weigh Station Comparison app (no Tk required)
+
+comparison_app_1.2.py is the Tk front end; everything it does with an
+entry once it is typed in goes through Engine, so the same code can be
+benchmarked, batch-run or embedded in other tools.
+"""
+from weighstation.engine import Engine
+from weighstation.entry import ValidationError, build_entry, check_required
+from weighstation.export import ExportCancelled, fill_template
+from weighstation.journal import Journal
+from weighstation.metrics import Metrics
+from weighstation.stations import STATIONS, STATION_SHORT_NAMES, export_file_name, short_name
+from weighstation.store import EntryStore
+from weighstation.template import TemplateCache
@@ -0,0 +1,195 @@
+"""Ramp bridge vs static scale discrepancy statistics (needs numpy)
+
+The app only shows the difference for the truck on the scale. This module
+loads months of stored entries into one NumPy array per column and
+computes, per group (station and axle class by default, or station and
+month to follow calibration drift), the mean, median and 95th percentile
+of the ramp-minus-static error and of the percentage error, plus robust
+outlier flags. Every statistic is computed for all groups at once from a
+single sort; there is no Python loop over entries or groups.
+
+    python -m weighstation.analytics --db records\\entries.db
+    python -m weighstation.analytics --by station month --from 2025-01-01 --csv drift.csv
+
+Outliers use the modified z-score 0.6745 * (error - median) / MAD of
+their group (Iglewicz & Hoaglin); |z| > 3.5 is flagged. Groups whose MAD is
+zero fall back to the mean absolute deviation.
+"""
+import argparse
+import csv
+import os
+import time
+
+import numpy as np
+
+OUTLIER_Z = 3.5
+GROUP_KEYS = ("station", "axle_class", "month", "day", "cargo_type")
+STAT_COLUMNS = ("count", "mean", "median", "p95", "mean_pct", "median_pct", "p95_pct", "outliers")
+
+
+def load_columns(store, **filters):
+    """Stored entries as a dict of NumPy arrays, one per column.
+
+    filters are the EntryStore.query() filters (station, date_from, ...).
+    """
+    rows = store.columns(("id", "station", "day", "axle_class", "cargo_type", "ramp_bridge", "static_scale"),
+                         **filters)
+    return columns_from_rows(rows)
+
+
+def columns_from_rows(rows):
+    """(id, station, day, axle_class, cargo_type, ramp_bridge, static_scale) tuples -> arrays"""
+    if rows:
+        ids, stations, days, axles, cargo, ramp, static = zip(*rows)
+    else:
+        ids = stations = days = axles = cargo = ramp = static = ()
+    days = np.array([day or "" for day in days], dtype="U10")
+    return {
+        "id": np.array(ids, dtype=np.int64),
+        "station": np.array(stations, dtype=object).astype(str),
+        "day": days,
+        "month": days.astype("U7"),
+        "axle_class": np.array(axles, dtype=np.int64),
+        "cargo_type": np.array(cargo, dtype=object).astype(str),
+        "ramp_bridge": np.array(ramp, dtype=np.float64),
+        "static_scale": np.array(static, dtype=np.float64),
+    }
+
+
+def _group_quantile(values, starts, counts, q):
+    """q-quantile of each group of an array already sorted by (group, value); NaN for empty groups"""
+    position = starts + np.maximum(counts - 1, 0) * q
+    last = max(len(values) - 1, 0)
+    low = np.minimum(np.floor(position).astype(np.int64), last)
+    high = np.minimum(np.ceil(position).astype(np.int64), last)
+    quantile = values[low] + (values[high] - values[low]) * (position - low)
+    quantile[counts == 0] = np.nan
+    return quantile
+
+
+def _group_stats(group, values, group_count):
+    """(mean, median, p95) of values per group id"""
+    order = np.lexsort((values, group))
+    sorted_values = values[order]
+    counts = np.bincount(group, minlength=group_count)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.bincount(group, weights=values, minlength=group_count) / counts
+    median = _group_quantile(sorted_values, starts, counts, 0.5)
+    p95 = _group_quantile(sorted_values, starts, counts, 0.95)
+    return mean, median, p95
+
+
+def discrepancies(columns, by=("station", "axle_class")):
+    """Per-group discrepancy statistics and per-entry outlier flags.
+
+    Returns (groups, flags): groups maps each key column in `by` and each
+    of STAT_COLUMNS to an array with one value per group, sorted by key;
+    flags is a dict with the per-entry error, pct_error, z score and
+    outlier mask, aligned with the input columns.
+    """
+    for key in by:
+        if key not in GROUP_KEYS:
+            raise ValueError(f"Cannot group by {key!r}; use one of {', '.join(GROUP_KEYS)}")
+    ramp = columns["ramp_bridge"]
+    static = columns["static_scale"]
+    error = ramp - static
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_error = np.where(static > 0, error / static * 100, np.nan)
+
+    if not len(error):
+        empty = {key: columns[key][:0] for key in by}
+        empty.update({name: np.zeros(0) for name in STAT_COLUMNS})
+        return empty, {"error": error, "pct_error": pct_error, "z": error, "outlier": error.astype(bool)}
+
+    # Integer group id per entry: the key columns' codes combined in mixed radix
+    combined = np.zeros(len(error), dtype=np.int64)
+    uniques = []
+    for key in by:
+        unique, code = np.unique(columns[key], return_inverse=True)
+        uniques.append(unique)
+        combined = combined * len(unique) + code.reshape(-1)
+    combined_keys, group = np.unique(combined, return_inverse=True)
+    group = group.reshape(-1)
+    group_count = len(combined_keys)
+    group_keys = np.empty((group_count, len(by)), dtype=np.int64)
+    for i in range(len(by) - 1, -1, -1):
+        combined_keys, group_keys[:, i] = np.divmod(combined_keys, len(uniques[i]))
+
+    mean, median, p95 = _group_stats(group, error, group_count)
+
+    # Percentage error ignores entries without a static weight
+    valid = ~np.isnan(pct_error)
+    pct_group = np.where(valid, group, group_count)  # invalid rows go to a spare group
+    pct_values = np.where(valid, pct_error, 0.0)
+    mean_pct, median_pct, p95_pct = (stat[:group_count] for stat in
+                                     _group_stats(pct_group, pct_values, group_count + 1))
+    no_pct = np.bincount(group[valid], minlength=group_count) == 0
+    for stat in (mean_pct, median_pct, p95_pct):
+        stat[no_pct] = np.nan
+
+    # Robust z-score against each group's median absolute deviation
+    deviation = np.abs(error - median[group])
+    _, mad, _ = _group_stats(group, deviation, group_count)
+    mean_deviation = np.bincount(group, weights=deviation, minlength=group_count) / np.bincount(group)
+    scale = np.where(mad > 0, mad / 0.6745, mean_deviation * 1.2533)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = np.where(scale[group] > 0, (error - median[group]) / scale[group], 0.0)
+    outlier = np.abs(z) > OUTLIER_Z
+
+    groups = {key: unique[group_keys[:, i]] for i, (key, unique) in enumerate(zip(by, uniques))}
+    groups.update({
+        "count": np.bincount(group, minlength=group_count),
+        "mean": mean, "median": median, "p95": p95,
+        "mean_pct": mean_pct, "median_pct": median_pct, "p95_pct": p95_pct,
+        "outliers": np.bincount(group, weights=outlier, minlength=group_count).astype(np.int64),
+    })
+    return groups, {"error": error, "pct_error": pct_error, "z": z, "outlier": outlier}
+
+
+def table_rows(groups, by):
+    """The group statistics as printable row tuples"""
+    for i in range(len(groups["count"])):
+        keys = tuple(groups[key][i].item() for key in by)
+        stats = tuple(round(float(groups[name][i]), 2) for name in STAT_COLUMNS)
+        yield keys + (int(stats[0]),) + stats[1:-1] + (int(stats[-1]),)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ramp bridge vs static scale discrepancy report")
+    parser.add_argument("--db", default=os.path.join("records", "entries.db"))
+    parser.add_argument("--by", nargs="+", default=["station", "axle_class"], choices=GROUP_KEYS)
+    parser.add_argument("--station")
+    parser.add_argument("--from", dest="date_from", help="first day, YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", help="last day, YYYY-MM-DD")
+    parser.add_argument("--csv", help="also write the table to this CSV file")
+    args = parser.parse_args()
+
+    from weighstation.store import EntryStore
+    store = EntryStore(args.db)
+    try:
+        start = time.perf_counter()
+        columns = load_columns(store, station=args.station, date_from=args.date_from, date_to=args.date_to)
+        loaded = time.perf_counter()
+        groups, flags = discrepancies(columns, args.by)
+        done = time.perf_counter()
+    finally:
+        store.close()
+
+    header = tuple(args.by) + STAT_COLUMNS
+    rows = list(table_rows(groups, args.by))
+    print("  ".join(f"{name:>16}" for name in header))
+    for row in rows:
+        print("  ".join(f"{value:>16}" for value in row))
+    print(f"{len(columns['id'])} entries, {len(rows)} groups, {int(flags['outlier'].sum())} outliers; "
+          f"loaded in {(loaded - start) * 1000:.0f} ms, analysed in {(done - loaded) * 1000:.0f} ms")
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(header)
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
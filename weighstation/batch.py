@@ -0,0 +1,114 @@
+"""Regenerate per-station, per-day workbooks from the entry store in parallel
+
+End of month, every (station, day) session in the store is exported again
+from data/comparison.xlsx under the same name print_data() suggests
+("RAMP & STATIC <short name> <date>.xlsx"). Sessions are filled and saved
+in a process pool, one worker per core by default. Each worker opens the
+store and parses the template once, then handles many sessions. The
+files written are listed in the store's imports table, so the importer
+does not load them back in as new entries.
+
+    python -m weighstation.batch "D:\\Exports\\June" --from 2025-06-01 --to 2025-06-30
+    python -m weighstation.batch out --station "S STATION NO. 2" --workers 2
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from weighstation.export import fill_template
+from weighstation.stations import export_file_name
+from weighstation.store import EntryStore
+from weighstation.template import TemplateCache
+
+# Per worker process, set up by _start_worker
+_worker = {}
+
+
+def _start_worker(db_path, template_path):
+    _worker["store"] = EntryStore(db_path)
+    _worker["template"] = TemplateCache(template_path)
+
+
+def export_session(out_dir, station, day):
+    """Fill and save one session's workbook; returns (path, rows, seconds). Runs in a worker."""
+    start = time.perf_counter()
+    entries = _worker["store"].query(station=station, date_from=day, date_to=day)
+    path = os.path.abspath(os.path.join(out_dir, export_file_name(station, entries[0]['date'])))
+    workbook = _worker["template"].load()
+    fill_template(workbook.active, station, entries)
+    workbook.save(path)
+    return path, len(entries), time.perf_counter() - start
+
+
+def export_sessions(db_path, template_path, out_dir, sessions, workers=None, progress=None):
+    """Export every (station, day) in sessions to out_dir.
+
+    workers defaults to the number of cores and is capped at the number of
+    cores and of sessions. progress(done, total, result) is called as each session
+    finishes, with result (path, rows, seconds). Returns a dict with
+    files ([(path, rows, seconds)]), failed ({(station, day): error}) and
+    seconds.
+    """
+    start = time.perf_counter()
+    os.makedirs(out_dir, exist_ok=True)
+    report = {"files": [], "failed": {}, "seconds": 0.0}
+    if sessions:
+        cores = os.cpu_count() or 1
+        workers = min(workers or cores, cores, len(sessions))
+        store = EntryStore(db_path)  # the workers only read; written files are recorded here
+        try:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_start_worker,
+                                     initargs=(db_path, template_path)) as pool:
+                futures = {pool.submit(export_session, out_dir, station, day): (station, day)
+                           for station, day in sessions}
+                for done, future in enumerate(as_completed(futures), 1):
+                    try:
+                        result = future.result()
+                        store.record_written(result[0], result[1])
+                        report["files"].append(result)
+                    except Exception as e:
+                        result = None
+                        report["failed"][futures[future]] = str(e)
+                    if progress:
+                        progress(done, len(futures), result)
+        finally:
+            store.close()
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-export stored sessions to the Excel template in parallel")
+    parser.add_argument("out_dir", help="folder for the workbooks (files with the same name are replaced)")
+    parser.add_argument("--db", default=os.path.join("records", "entries.db"))
+    parser.add_argument("--template", default=os.path.join("data", "comparison.xlsx"))
+    parser.add_argument("--station")
+    parser.add_argument("--from", dest="date_from", help="first day, YYYY-MM-DD")
+    parser.add_argument("--to", dest="date_to", help="last day, YYYY-MM-DD")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per core)")
+    args = parser.parse_args()
+
+    store = EntryStore(args.db)
+    try:
+        sessions = store.sessions(args.station, args.date_from, args.date_to)
+    finally:
+        store.close()
+    print(f"{len(sessions)} sessions, {sum(count for *_, count in sessions)} entries")
+
+    def progress(done, total, result):
+        if result:
+            path, rows, seconds = result
+            print(f"[{done}/{total}] {os.path.basename(path)}: {rows} rows in {seconds:.2f} s")
+
+    report = export_sessions(args.db, args.template, args.out_dir,
+                             [(station, day) for station, day, _, _ in sessions], args.workers, progress)
+    for (station, day), error in report["failed"].items():
+        print(f"Failed: {station} {day}: {error}")
+    rows = sum(rows for _, rows, _ in report["files"])
+    print(f"Wrote {len(report['files'])} workbooks ({rows} rows) in {report['seconds']:.1f} s, "
+          f"{len(report['failed'])} failed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Screen capture profiles: region, downscale and encoder settings per station"""
+import json
+import os
+import time
+
+# "full" matches what the app always did: whole screen, JPEG at Pillow's defaults
+DEFAULT_PROFILES = {
+    "full": {"bbox": None, "max_size": None, "format": "JPEG", "quality": 75,
+             "progressive": False, "optimize": False},
+    "compact": {"bbox": None, "max_size": 1600, "format": "JPEG", "quality": 70,
+                "progressive": True, "optimize": True},
+    "webp": {"bbox": None, "max_size": 1600, "format": "WEBP", "quality": 70},
+}
+
+EXTENSIONS = {"JPEG": "jpeg", "WEBP": "webp"}
+
+
+class CaptureSettings:
+    """Capture profiles and which one each station uses.
+
+    Read from a JSON file shaped like
+        {"default": "full",
+         "profiles": {"scale_window": {"bbox": [0, 0, 1280, 1024], "quality": 80}},
+         "stations": {"D STATION NO. 1": "scale_window"}}
+    Profiles in the file are merged over the built-in ones, and missing keys
+    fall back to the "full" profile.
+    """
+
+    def __init__(self, profiles=None, stations=None, default="full"):
+        self.profiles = dict(DEFAULT_PROFILES)
+        self.profiles.update(profiles or {})
+        self.stations = stations or {}
+        self.default = default
+
+    @classmethod
+    def load(cls, path):
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "r") as f:
+            data = json.load(f)
+        return cls(data.get("profiles"), data.get("stations"), data.get("default", "full"))
+
+    def profile_for(self, station):
+        name = self.stations.get(station, self.default)
+        profile = dict(DEFAULT_PROFILES["full"])
+        profile.update(self.profiles.get(name, {}))
+        profile["format"] = profile["format"].upper()
+        if profile["format"] not in EXTENSIONS:
+            raise ValueError(f"Unsupported screenshot format: {profile['format']}")
+        return profile
+
+
+def grab(profile):
+    """Capture the screen (or the profile's bounding box). Call on the Tk thread."""
+    from PIL import ImageGrab
+    bbox = profile.get("bbox")
+    return ImageGrab.grab(bbox=tuple(bbox) if bbox else None,
+                          all_screens=bool(profile.get("all_screens", False)))
+
+
+def encode(image, profile, f):
+    """Downscale and encode image into the open binary file f.
+
+    Returns (bytes written, encode time in milliseconds).
+    """
+    from PIL import Image
+    start = time.perf_counter()
+    image = image.convert("RGB")
+    max_size = profile.get("max_size")
+    if max_size and max(image.size) > max_size:
+        image.thumbnail((max_size, max_size), Image.LANCZOS, reducing_gap=2.0)
+
+    options = {"quality": profile.get("quality", 75)}
+    if profile["format"] == "JPEG":
+        options["progressive"] = bool(profile.get("progressive"))
+        options["optimize"] = bool(profile.get("optimize"))
+    else:
+        options["method"] = profile.get("method", 4)
+    image.save(f, profile["format"], **options)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    return f.tell(), elapsed_ms
@@ -0,0 +1,79 @@
+"""Prefix completion shared by the combobox keyboard helpers"""
+import os
+from bisect import bisect_left
+
+_HIGHEST = "\U0010ffff"  # sorts after any character a prefix can be followed by
+
+
+def load_vocabulary(path, default):
+    """Read one item per line (blank lines and # comments skipped), or return default"""
+    if not os.path.exists(path):
+        return list(default)
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                items.append(line)
+    return items
+
+
+class CompletionIndex:
+    """Sorted, lowercased keys searched with bisect.
+
+    Matches for a prefix are ranked by weight (highest first) and then by
+    the order items were added, so without weights the first match is the
+    same one the old linear scan over the list returned. Ranked results are
+    cached per prefix until the index changes.
+    """
+
+    def __init__(self, items=(), weights=None):
+        self._keys = []     # sorted (lowercase item, item)
+        self._order = {}    # item -> insertion order
+        self._weights = {}
+        self._cache = {}
+        for item in items:
+            self._order.setdefault(item, len(self._order))
+        self._keys = sorted((item.lower(), item) for item in self._order)
+        if weights:
+            self._weights.update(weights)
+
+    def __contains__(self, item):
+        return item in self._order
+
+    def __len__(self):
+        return len(self._order)
+
+    def items(self):
+        return sorted(self._order, key=self._order.get)
+
+    def add(self, item, weight=None):
+        """Add item (or just update its weight if it is already known)"""
+        if item not in self._order:
+            self._order[item] = len(self._order)
+            key = (item.lower(), item)
+            self._keys.insert(bisect_left(self._keys, key), key)
+        if weight is not None:
+            self._weights[item] = weight
+        self._cache.clear()
+
+    def _rank(self, item):
+        return (-self._weights.get(item, 0), self._order[item])
+
+    def complete(self, prefix, limit=10):
+        """Up to limit items starting with prefix (any case), best first"""
+        prefix = prefix.lower()
+        ranked = self._cache.get(prefix)
+        if ranked is None:
+            start = bisect_left(self._keys, (prefix,))
+            end = bisect_left(self._keys, (prefix + _HIGHEST,))
+            ranked = sorted((item for _, item in self._keys[start:end]), key=self._rank)
+            if len(self._cache) >= 1024:
+                self._cache.clear()
+            self._cache[prefix] = ranked
+        return ranked[:limit]
+
+    def first(self, prefix):
+        """Best match for prefix, or None"""
+        matches = self.complete(prefix, 1)
+        return matches[0] if matches else None
@@ -0,0 +1,91 @@
+"""Catch the same truck being saved twice (double F2, re-typed after a crash)"""
+import time
+from collections import deque
+from datetime import datetime
+
+WINDOW_SECONDS = 3600  # same plate and weights within an hour counts as a repeat
+REBUILD_COLUMNS = ("id", "station", "date", "plate_number", "ramp_bridge", "static_scale", "saved_at")
+
+
+def duplicate_key(entry):
+    return (entry['station'], entry['date'], entry['plate_number'],
+            int(entry['ramp_bridge']), int(entry['static_scale']))
+
+
+class DuplicateIndex:
+    """Hash index of recent saves keyed on (station, date, plate, ramp, static).
+
+    find() is a dict lookup plus a scan of the few saves sharing that key,
+    so it costs the same with ten or ten thousand trucks in the day. Saves
+    older than the window are expired as new ones come in; rebuild() fills
+    the index from the entry store at startup.
+    """
+
+    def __init__(self, window_seconds=WINDOW_SECONDS):
+        self.window = window_seconds
+        self.keys = {}        # key -> [(saved_at, id)], oldest first
+        self.order = deque()  # (saved_at, key, id) in save order, for expiry
+
+    def __len__(self):
+        return len(self.order)
+
+    def add(self, entry, saved_at=None):
+        saved_at = time.time() if saved_at is None else saved_at
+        key = duplicate_key(entry)
+        self.keys.setdefault(key, []).append((saved_at, entry.get('id')))
+        self.order.append((saved_at, key, entry.get('id')))
+        self._expire(saved_at)
+
+    def discard(self, entry):
+        """Forget a save (rolled back or removed as a duplicate)"""
+        key = duplicate_key(entry)
+        bucket = [item for item in self.keys.get(key, ()) if item[1] != entry.get('id')]
+        if bucket:
+            self.keys[key] = bucket
+        else:
+            self.keys.pop(key, None)
+
+    def _expire(self, now):
+        while self.order and self.order[0][0] < now - self.window:
+            saved_at, key, entry_id = self.order.popleft()
+            bucket = self.keys.get(key)
+            if bucket and (saved_at, entry_id) in bucket:
+                bucket.remove((saved_at, entry_id))
+                if not bucket:
+                    del self.keys[key]
+
+    def find(self, entry):
+        """(saved_at, id) of an earlier save of the same truck within the window, or None.
+
+        An entry already in the index (it has an id) is compared with the
+        saves before it; a new one with the saves in the last window seconds.
+        """
+        bucket = self.keys.get(duplicate_key(entry), ())
+        entry_id = entry.get('id')
+        position = next((i for i, (_, other_id) in enumerate(bucket)
+                         if entry_id is not None and other_id == entry_id), None)
+        if position is None:
+            at, earlier = time.time(), bucket
+        else:
+            # Saves share a second easily (double F2), so go by save order, not time
+            at, earlier = bucket[position][0], bucket[:position]
+        for saved_at, other_id in reversed(earlier):
+            if saved_at >= at - self.window:
+                return saved_at, other_id
+        return None
+
+    def rebuild(self, rows):
+        """Fill from EntryStore.columns(REBUILD_COLUMNS, ...) rows, oldest first.
+
+        Nothing is expired against the clock here, so entries recovered from
+        an older crash can still be checked against each other.
+        """
+        self.keys = {}
+        self.order = deque()
+        for entry_id, station, date, plate, ramp, static, saved_at in rows:
+            try:
+                entry = {'id': entry_id, 'station': station, 'date': date, 'plate_number': plate,
+                         'ramp_bridge': ramp, 'static_scale': static}
+                self.add(entry, datetime.fromisoformat(saved_at).timestamp())
+            except (TypeError, ValueError):
+                continue  # incomplete row from an import
@@ -0,0 +1,189 @@
+"""Everything the app does with an entry once it is typed in, without Tk"""
+import os
+from datetime import datetime, timedelta
+
+from weighstation import capture
+from weighstation.duplicates import REBUILD_COLUMNS, DuplicateIndex
+from weighstation.entry import build_entry
+from weighstation.export import check_cancelled, fill_template
+from weighstation.history import SessionHistory
+from weighstation.journal import Journal
+from weighstation.metrics import Metrics
+from weighstation.plates import PlateDirectory
+from weighstation.screenshots import FilenameIndex
+from weighstation.stations import screenshot_folder_name
+from weighstation.store import EntryStore
+from weighstation.summary import DailySummary
+from weighstation.tabular import is_table_path, write_table
+from weighstation.template import TemplateCache
+
+
+class Engine:
+    """Owns the session history, autosave journal, entry store, plate
+    directory and Excel template under one working folder:
+
+        backups/   autosave snapshot + journal, session spill file, daily summary
+        records/   entries.db, plates.json
+        logs/      metrics.jsonl (timing of the hot paths, rotated)
+
+    The GUI calls these methods and only deals with widgets; scripts,
+    benchmarks and services can drive the same code without a display.
+    """
+
+    def __init__(self, base_dir, template_path, window=100, axle_limits=None):
+        backup_dir = os.path.join(base_dir, "backups")
+        records_dir = os.path.join(base_dir, "records")
+        self.journal = Journal(backup_dir)
+        self.history = SessionHistory(os.path.join(backup_dir, "session_spill.jsonl"), window)
+        self.store = EntryStore(os.path.join(records_dir, "entries.db"))
+        self.plates = PlateDirectory(os.path.join(records_dir, "plates.json"))
+        self.summary = DailySummary(os.path.join(backup_dir, "daily_summary.json"), axle_limits)
+        self.duplicates = DuplicateIndex()
+        self.template = TemplateCache(template_path)
+        self.screenshot_names = FilenameIndex()
+        self.metrics = Metrics(os.path.join(base_dir, "logs", "metrics.jsonl"))
+
+    def load_plates(self):
+        """Load the plate directory, adding entries stored since its last save"""
+        self.plates.check(self.store)
+
+    def load_summary(self):
+        """Load the daily totals, rebuilding them from the store if they are stale"""
+        self.summary.check(self.store)
+
+    def load_duplicates(self):
+        """Index yesterday's and today's saves for find_duplicate()"""
+        since = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        self.duplicates.rebuild(self.store.columns(REBUILD_COLUMNS, date_from=since))
+
+    # --- Saving entries ---
+
+    def find_duplicate(self, station, date, values):
+        """(saved_at, id) of the same truck saved within the last hour, or None.
+
+        Builds the entry like save_entry(), so it raises the same errors.
+        """
+        return self.duplicates.find(build_entry(station, date, values))
+
+    def save_entry(self, station, date, values, destination=""):
+        """Validate, store and autosave one truck; returns the entry"""
+        entry = build_entry(station, date, values, destination)
+        entry['id'] = self.store.insert(entry)
+        self.summary.add(entry, save=False)
+        self.duplicates.add(entry)
+        try:
+            self.history.append(entry)
+        except Exception:
+            # Not in the session, so not saved at all: undo the store, totals and index
+            self.summary.remove(entry, save=False)
+            self.duplicates.discard(entry)
+            self.store.delete([entry['id']])
+            raise
+        self.plates.record(entry)
+        self.autosave(entry)
+        return entry
+
+    def autosave(self, entry):
+        """Append the new entry to the autosave journal (compacting it now and then) and save the daily totals"""
+        try:
+            with self.metrics.timed("autosave") as m:
+                m["bytes"] = self.journal.append(entry)
+                if self.journal.needs_compaction():
+                    m["bytes"] += self.journal.compact(self.history)
+                    m["rows"] = len(self.history)
+        except Exception as e:
+            print(f"Failed to autosave input history: {e}")
+        try:
+            self.summary.save()
+        except Exception as e:
+            print(f"Failed to save daily summary: {e}")
+
+    # --- Crash recovery ---
+
+    def recover(self):
+        """Entries the last session left unexported (snapshot + journal replay)"""
+        return self.journal.recover()
+
+    def recovered_duplicates(self, entries):
+        """The recovered entries that repeat an earlier save of the same truck"""
+        return [entry for entry in entries if 'id' in entry and self.duplicates.find(entry)]
+
+    def restore(self, entries, drop=()):
+        """Put recovered entries back in the session, leaving out (and deleting) drop"""
+        dropped = {id(entry) for entry in drop}
+        for entry in drop:
+            self.store.delete([entry['id']])
+            self.summary.remove(entry, save=False)
+            self.duplicates.discard(entry)
+        entries = [entry for entry in entries if id(entry) not in dropped]
+        # Autosaves written before the entry store existed have no id yet
+        for entry in entries:
+            if 'id' not in entry:
+                entry['id'] = self.store.insert(entry)
+                self.summary.add(entry, save=False)
+                self.duplicates.add(entry)
+                self.plates.record(entry, save=False)
+        self.history.extend(entries)
+        self.journal.compact(self.history)
+        self.summary.save()
+        self.plates.save()
+
+    def discard_recovered(self):
+        self.journal.clear()
+
+    # --- Excel export ---
+
+    def export(self, path, station, entries, progress=None, cancel=None):
+        """Fill a fresh copy of the template and save it, or write a .csv,
+        .parquet or .npz table when path has that extension. Safe to run on
+        a worker thread."""
+        with self.metrics.timed("export", rows=len(entries)) as m:
+            m["format"] = os.path.splitext(path)[1].lower().lstrip(".")
+            if is_table_path(path):
+                write_table(path, entries, progress=progress, cancel=cancel)
+            else:
+                workbook = self.template.load()
+                fill_template(workbook.active, station, entries, progress=progress, cancel=cancel)
+                check_cancelled(cancel)  # Last chance: the save itself can't be interrupted
+                workbook.save(path)
+            m["bytes"] = os.path.getsize(path)
+        return len(entries)
+
+    def finish_export(self, entries, path=None):
+        """Mark entries written to the Excel template exported and drop them
+        from the session; returns their ids. Table exports (.csv, ...) are
+        side copies and don't go through here.
+
+        The workbook path is remembered so the importer skips that file.
+        """
+        exported_ids = [entry['id'] for entry in entries if 'id' in entry]
+        self.store.mark_exported(exported_ids, file=os.path.abspath(path) if path else None)
+        self.history.remove_first(len(entries))
+        if self.history:
+            self.journal.drop_oldest(len(entries))
+        else:
+            self.journal.clear()
+        return exported_ids
+
+    # --- Screenshots ---
+
+    def save_screenshot(self, image, dest_folder, station, plate_number, profile):
+        """Encode and write a capture; returns (file name, bytes, encode ms)"""
+        folder = os.path.join(dest_folder, screenshot_folder_name(station))
+        safe_plate_number = "".join(c for c in plate_number if c.isalnum())
+
+        extension = capture.EXTENSIONS[profile["format"]]
+        path, f = self.screenshot_names.create(folder, safe_plate_number, extension)
+        try:
+            with self.metrics.timed("screenshot_write", profile=profile["format"]) as m, f:
+                size, encode_ms = capture.encode(image, profile, f)
+                m["bytes"] = size
+        except Exception:
+            os.remove(path)  # Don't leave an empty file holding the name
+            raise
+        return os.path.basename(path), size, encode_ms
+
+    def close(self):
+        self.plates.save()
+        self.store.close()
+        self.metrics.close()
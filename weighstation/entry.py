@@ -0,0 +1,40 @@
+"""Turn the values typed into the form into an entry record"""
+
+REQUIRED_FIELDS = ('axle_class', 'plate_number', 'cargo_type', 'ramp_bridge', 'static_scale', 'speed')
+NUMERIC_FIELDS = ('axle_class', 'ramp_bridge', 'static_scale', 'speed')
+
+
+class ValidationError(Exception):
+    """A required value is missing; the message is meant for the operator"""
+
+
+def check_required(station, date, values):
+    """Raise ValidationError for the first missing value, in the order the operator fills them"""
+    if not station:
+        raise ValidationError("Please select a station first.")
+    if not date.strip():
+        raise ValidationError("Please enter the date first.")
+    if not all(str(values.get(key, "")).strip() for key in REQUIRED_FIELDS):
+        raise ValidationError("Please complete all the details first.")
+
+
+def build_entry(station, date, values, destination=""):
+    """Check and convert one truck's values.
+
+    values maps the entry keys (axle_class, plate_number, ...) to the text
+    typed in the form. Raises ValidationError when something is missing and
+    ValueError when a numeric field is not a number.
+    """
+    check_required(station, date, values)
+    cleaned = {key: str(values[key]).strip() for key in REQUIRED_FIELDS}
+    return {
+        'station': station,
+        'date': date,
+        'axle_class': int(cleaned['axle_class']),
+        'plate_number': cleaned['plate_number'].upper(),
+        'cargo_type': cleaned['cargo_type'],
+        'ramp_bridge': int(cleaned['ramp_bridge']),
+        'static_scale': int(cleaned['static_scale']),
+        'speed': int(cleaned['speed']),
+        'destination': destination,
+    }
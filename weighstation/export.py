@@ -0,0 +1,112 @@
+"""Write stored entries into the comparison Excel template"""
+from copy import copy
+
+# How often (in rows) fill_template reports progress and checks for cancel
+PROGRESS_EVERY = 500
+
+# Row of the first entry in data/comparison.xlsx
+FIRST_ROW = 8
+
+# Template column numbers (A=1) for each entry field
+ENTRY_COLUMNS = (
+    (2, 'axle_class'),    # B
+    (3, 'plate_number'),  # C
+    (4, 'cargo_type'),    # D
+    (5, 'ramp_bridge'),   # E
+    (6, 'static_scale'),  # F
+    (8, 'speed'),         # H
+)
+
+
+class ExportCancelled(Exception):
+    """Raised by fill_template when the cancel event is set"""
+
+
+def check_cancelled(cancel):
+    """Raise ExportCancelled if the cancel event (threading.Event or None) is set"""
+    if cancel is not None and cancel.is_set():
+        raise ExportCancelled()
+
+
+def entry_row(entry):
+    """Return the template row values for an entry, numeric fields as integers"""
+    return (
+        int(entry['axle_class']),
+        entry['plate_number'],
+        entry['cargo_type'],
+        int(entry['ramp_bridge']),
+        int(entry['static_scale']),
+        int(entry['speed']),
+    )
+
+
+def first_free_row(sheet, start_row=FIRST_ROW + 1):
+    """Return the first row at or after start_row whose column B is empty"""
+    row = start_row
+    while sheet.cell(row=row, column=2).value is not None:
+        row += 1
+    return row
+
+
+def write_row(sheet, row, values):
+    for (column, _), value in zip(ENTRY_COLUMNS, values):
+        sheet.cell(row=row, column=column, value=value)
+
+
+def extend_template_row(sheet, row, style_row):
+    """Give a row past the end of the template the same number, formulas and style"""
+    for column in range(1, 11):
+        source = sheet.cell(row=style_row, column=column)
+        if source.has_style:
+            sheet.cell(row=row, column=column)._style = copy(source._style)
+    sheet.cell(row=row, column=1, value=row - FIRST_ROW + 1)
+    sheet.cell(row=row, column=7, value=f"=IF(E{row}>F{row},E{row}-F{row},IF(E{row}<F{row},E{row}-F{row}))")
+    sheet.cell(row=row, column=9, value="km/h")
+    sheet.cell(row=row, column=10, value=f"=F{row}/E{row}-100%")
+
+
+def fill_template(sheet, station, entries, progress=None, cancel=None):
+    """Write the station header, date and every entry into the template sheet.
+
+    All entries are converted before anything is written, so a ValueError or
+    TypeError leaves the sheet untouched. The first free row is looked up once
+    and a write cursor is advanced from there, which keeps the cost per row
+    flat no matter how many entries are exported. Returns the number of rows.
+
+    progress(done, total) is called every PROGRESS_EVERY rows, and the export
+    stops with ExportCancelled once the cancel event (threading.Event) is set;
+    it is checked before the first row, every PROGRESS_EVERY rows and after
+    the last one.
+    """
+    rows = [entry_row(entry) for entry in entries]
+    check_cancelled(cancel)
+
+    if station:
+        sheet['A1'] = f"{station} WEIGH STATION"
+    else:
+        sheet['A1'] = "WEIGH STATION"
+
+    if not rows:
+        return 0
+
+    # First entry always goes to the template's first row
+    sheet['B2'] = entries[0]['date']
+    write_row(sheet, FIRST_ROW, rows[0])
+
+    last_template_row = sheet.max_row
+    cursor = first_free_row(sheet)
+    total = len(rows)
+    for done, values in enumerate(rows[1:], 1):
+        if done % PROGRESS_EVERY == 0:
+            check_cancelled(cancel)
+            if progress:
+                progress(done, total)
+        if cursor > last_template_row:
+            extend_template_row(sheet, cursor, last_template_row)
+        write_row(sheet, cursor, values)
+        cursor += 1
+
+    check_cancelled(cancel)
+    if progress:
+        progress(total, total)
+    return total
@@ -0,0 +1,88 @@
+"""Session history with a small in-memory window and spill-to-disk"""
+import json
+import os
+from collections import deque
+
+
+class SessionHistory:
+    """Entries saved since the last export, oldest first.
+
+    Only the newest `window` entries are kept in memory (a deque, so append
+    and evict are O(1)). Older entries are appended to a JSON-lines spill
+    file instead of being dropped, and iteration streams them back from
+    disk before the in-memory ones, so an export still sees the whole shift.
+
+    Entries only ever leave from the front, after an export, through
+    remove_first(). Exported spill lines are skipped with an offset, and
+    the file is truncated once all of them are gone.
+    """
+
+    def __init__(self, spill_path, window=100):
+        self.spill_path = spill_path
+        self.window = window
+        self._recent = deque()
+        self._spilled = 0   # lines in the spill file
+        self._skip = 0      # leading spill lines already exported
+        self._spill_file = None
+        # Anything spilled by a previous run comes back through the journal
+        if os.path.exists(spill_path):
+            os.remove(spill_path)
+
+    def __len__(self):
+        return self._spilled - self._skip + len(self._recent)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        if self._spilled > self._skip:
+            self._spill_file.flush()
+            with open(self.spill_path, "r") as f:
+                for index, line in enumerate(f):
+                    if index >= self._skip:
+                        yield json.loads(line)
+        yield from list(self._recent)
+
+    def append(self, entry):
+        self._recent.append(entry)
+        if len(self._recent) > self.window:
+            self._spill(self._recent.popleft())
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def recent(self):
+        """The entries currently held in memory"""
+        return list(self._recent)
+
+    def _spill(self, entry):
+        if self._spill_file is None:
+            folder = os.path.dirname(self.spill_path)
+            if folder:
+                os.makedirs(folder, exist_ok=True)
+            self._spill_file = open(self.spill_path, "a")
+        self._spill_file.write(json.dumps(entry) + "\n")
+        self._spilled += 1
+
+    def remove_first(self, count):
+        """Drop the oldest count entries (those just exported)"""
+        from_spill = min(count, self._spilled - self._skip)
+        self._skip += from_spill
+        for _ in range(min(count - from_spill, len(self._recent))):
+            self._recent.popleft()
+        if self._skip == self._spilled:
+            self._reset_spill()
+
+    def clear(self):
+        self._recent.clear()
+        self._reset_spill()
+
+    def _reset_spill(self):
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        if os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+        self._spilled = 0
+        self._skip = 0
@@ -0,0 +1,62 @@
+"""Pre-sized copies of the toolbar icons, so startup does not resize images
+
+The app shows every icon at a fixed size. Resizing the full-size PNGs with
+Pillow on each start costs more than the rest of the window on an old
+station PC, so the resized copies are written once to assets/sized/ and
+loaded with plain tk.PhotoImage. Icons with no full-size original in
+assets/ (check, revert, open-folder, reset, clock) only exist as their
+sized copy, which build() leaves alone. Run after changing an icon:
+
+    python -m weighstation.icons
+"""
+import os
+import sys
+
+# Icon file in assets/ -> size (px) it is shown at
+ICON_SIZES = {
+    "check.png": 15,
+    "revert.png": 15,
+    "open-folder.png": 20,
+    "reset.png": 20,
+    "camera.png": 20,
+    "save.png": 20,
+    "excel.png": 20,
+    "clock.png": 20,
+}
+SIZED_FOLDER = "sized"
+
+
+def sized_name(name, size):
+    """File name of the pre-sized copy, e.g. camera.png at 20 -> camera-20.png"""
+    stem, extension = os.path.splitext(name)
+    return f"{stem}-{size}{extension}"
+
+
+def resize(path, size):
+    """Pillow image of path scaled to size x size (the fallback when no copy exists)"""
+    from PIL import Image
+    with Image.open(path) as image:
+        return image.convert("RGBA").resize((size, size), Image.LANCZOS)
+
+
+def build(assets_dir, sizes=None):
+    """Write assets/sized/<name>-<size>.png for every icon; returns the names written"""
+    sizes = ICON_SIZES if sizes is None else sizes
+    folder = os.path.join(assets_dir, SIZED_FOLDER)
+    os.makedirs(folder, exist_ok=True)
+    written = []
+    for name, size in sizes.items():
+        path = os.path.join(assets_dir, name)
+        if not os.path.exists(path):
+            print(f"Skipping missing icon: {name}")
+            continue
+        target = sized_name(name, size)
+        resize(path, size).save(os.path.join(folder, target), optimize=True)
+        written.append(target)
+    return written
+
+
+if __name__ == "__main__":
+    assets = sys.argv[1] if len(sys.argv) > 1 else "assets"
+    for name in build(assets):
+        print(f"Wrote {os.path.join(assets, SIZED_FOLDER, name)}")
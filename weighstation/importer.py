@@ -0,0 +1,173 @@
+"""Bulk import of exported comparison workbooks into the entry store
+
+Every export written by the app ("RAMP & STATIC <station> <date>.xlsx")
+has the template layout: "<station> WEIGH STATION" in A1, the date in B2
+and one truck per row from row 8 (B axle, C plate, D cargo, E ramp,
+F static, H speed). import_folder() walks a folder tree, reads the
+workbooks in worker processes with openpyxl's read-only streaming mode and
+stores the rows as exported entries, one transaction per file. Files
+imported before, and workbooks the app exported from the store itself,
+are skipped, so the same archive can be imported again after new exports
+are added.
+
+    python -m weighstation.importer "D:\\Exports" --db records\\entries.db
+"""
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, datetime
+
+from weighstation.entry import ValidationError, build_entry
+from weighstation.export import ENTRY_COLUMNS, FIRST_ROW
+from weighstation.store import DATE_FORMAT, EntryStore, parse_day
+
+STATION_SUFFIX = "WEIGH STATION"
+LAST_COLUMN = max(column for column, _ in ENTRY_COLUMNS)
+
+
+class NotAnExport(Exception):
+    """The workbook does not have the comparison template's header"""
+
+
+def find_workbooks(folder):
+    """Every .xlsx under folder, skipping Excel's ~$ lock files, sorted"""
+    paths = []
+    for parent, _, names in os.walk(folder):
+        for name in names:
+            if name.lower().endswith(".xlsx") and not name.startswith("~$"):
+                paths.append(os.path.abspath(os.path.join(parent, name)))
+    return sorted(paths)
+
+
+def date_text(value):
+    """B2 as the app writes it; cells retyped in Excel come back as datetimes"""
+    if isinstance(value, (datetime, date)):
+        return value.strftime(DATE_FORMAT)
+    return str(value or "").strip()
+
+
+def _open_export(path):
+    """Open an export read-only; returns (workbook, station, date, remaining rows)"""
+    from openpyxl import load_workbook
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(min_col=1, max_col=LAST_COLUMN, values_only=True)
+        header = next(rows, ())
+        title = str(header[0] or "").strip() if header else ""
+        if not title.endswith(STATION_SUFFIX):
+            raise NotAnExport(f"A1 is {title!r}, not '<station> {STATION_SUFFIX}'")
+        station = title[:-len(STATION_SUFFIX)].strip()
+        second = next(rows, ())
+        day = date_text(second[1] if len(second) > 1 else None)
+    except Exception:
+        workbook.close()
+        raise
+    return workbook, station, day, rows
+
+
+def read_header(path):
+    """(station, date) of an export, without reading its rows"""
+    workbook, station, day, _ = _open_export(path)
+    workbook.close()
+    return station, day
+
+
+def iter_export(path):
+    """Stream the trucks of one export: an entry dict per row, None for incomplete rows"""
+    workbook, station, day, rows = _open_export(path)
+    try:
+        for number, row in enumerate(rows, 3):
+            if number < FIRST_ROW:
+                continue
+            values = {field: row[column - 1] for column, field in ENTRY_COLUMNS}
+            if all(value is None for value in values.values()):
+                continue  # numbered template row without a truck
+            try:
+                yield build_entry(station, day, values)
+            except (ValidationError, ValueError):
+                yield None
+    finally:
+        workbook.close()
+
+
+def read_workbook(path):
+    """Read one export; returns (path, entries, skipped row count).
+
+    Runs in a worker process, so it only takes and returns plain data.
+    """
+    entries = list(iter_export(path))
+    valid = [entry for entry in entries if entry is not None]
+    return path, valid, len(entries) - len(valid)
+
+
+def import_folder(store, folder, workers=None, progress=None):
+    """Import every new export under folder into store.
+
+    progress(done, total, path) is called after each file. Returns a dict
+    with files, rows, skipped_rows, already_imported, already_stored,
+    failed ({path: error}) and seconds.
+
+    already_stored counts workbooks whose every truck is already in the
+    store as exported for that station and day: exports the app wrote
+    before it started recording their paths.
+    """
+    start = time.perf_counter()
+    paths = find_workbooks(folder)
+    done_before = store.imported_files()
+    pending = [path for path in paths if path not in done_before]
+    report = {"files": 0, "rows": 0, "skipped_rows": 0, "already_imported": len(paths) - len(pending),
+              "already_stored": 0, "failed": {}, "seconds": 0.0}
+
+    # Parsing runs in parallel; the SQLite writes stay in this process
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(read_workbook, path): path for path in pending}
+        for done, future in enumerate(as_completed(futures), 1):
+            path = futures[future]
+            try:
+                _, entries, skipped = future.result()
+                day = parse_day(entries[0]['date']) if entries else None
+                if day and store.holds_exported(entries[0]['station'], day, entries):
+                    store.record_import(path, [])
+                    report["already_stored"] += 1
+                else:
+                    report["rows"] += store.record_import(path, entries)
+                    report["skipped_rows"] += skipped
+                    report["files"] += 1
+            except Exception as e:
+                report["failed"][path] = str(e)
+            if progress:
+                progress(done, len(pending), path)
+
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import exported comparison workbooks into the entry store")
+    parser.add_argument("folder", help="folder searched recursively for .xlsx exports")
+    parser.add_argument("--db", default=os.path.join("records", "entries.db"))
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    args = parser.parse_args()
+
+    def progress(done, total, path):
+        print(f"[{done}/{total}] {os.path.basename(path)}")
+
+    store = EntryStore(args.db)
+    try:
+        report = import_folder(store, args.folder, args.workers, progress)
+    finally:
+        store.close()
+
+    for path, error in report["failed"].items():
+        print(f"Failed: {path}: {error}")
+    seconds = report["seconds"]
+    rate = report["rows"] / seconds if seconds else 0
+    print(f"Imported {report['rows']} rows from {report['files']} files in {seconds:.1f} s ({rate:.0f} rows/s); "
+          f"{report['already_imported']} files already imported, "
+          f"{report['already_stored']} already in the store, {len(report['failed'])} failed, "
+          f"{report['skipped_rows']} incomplete rows skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Append-only autosave journal with periodic snapshots for crash recovery"""
+import json
+import os
+import zlib
+
+SNAPSHOT_NAME = "autosave_snapshot.json"
+JOURNAL_NAME = "autosave_journal.jsonl"
+LEGACY_NAME = "autosave_input_history.json"  # full rewrite used up to v1.2
+
+
+def _checksum(record):
+    body = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return zlib.crc32(body.encode("utf-8"))
+
+
+def _write_atomic(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f)
+        f.flush()
+        os.fsync(f.fileno())
+        size = f.tell()
+    os.replace(tmp_path, path)
+    return size
+
+
+class Journal:
+    """Write-ahead log of the unexported entries.
+
+    Each save appends one JSON line {"seq", "op", ..., "crc"} and fsyncs it,
+    so the cost per entry no longer grows with the history. Every
+    compact_every records the caller folds the log into a snapshot file
+    (written to a temp file and swapped in) and the log starts over.
+    recover() loads the snapshot and replays the log after it, stopping at
+    the first line with a bad checksum (a write torn by a crash).
+    """
+
+    def __init__(self, folder, compact_every=200):
+        self.folder = folder
+        self.compact_every = compact_every
+        self.snapshot_path = os.path.join(folder, SNAPSHOT_NAME)
+        self.journal_path = os.path.join(folder, JOURNAL_NAME)
+        self.legacy_path = os.path.join(folder, LEGACY_NAME)
+        self.seq = 0
+        self.pending = 0  # records written since the last snapshot
+
+    def _append(self, record):
+        os.makedirs(self.folder, exist_ok=True)
+        self.seq += 1
+        record["seq"] = self.seq
+        record["crc"] = _checksum(record)
+        line = json.dumps(record) + "\n"
+        with open(self.journal_path, "a") as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+        self.pending += 1
+        return len(line)
+
+    def append(self, entry):
+        """Record a newly saved entry; returns the bytes written"""
+        return self._append({"op": "add", "entry": entry})
+
+    def drop_oldest(self, count=1):
+        """Record that the oldest count entries left the history"""
+        return self._append({"op": "drop", "count": count})
+
+    def needs_compaction(self):
+        return self.pending >= self.compact_every
+
+    def compact(self, entries):
+        """Replace snapshot and log with a single snapshot of entries; returns its size"""
+        os.makedirs(self.folder, exist_ok=True)
+        size = _write_atomic(self.snapshot_path, {"seq": self.seq, "entries": list(entries)})
+        for path in (self.journal_path, self.legacy_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.pending = 0
+        return size
+
+    def clear(self):
+        """Forget everything (after a successful export)"""
+        for path in (self.snapshot_path, self.journal_path, self.legacy_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.pending = 0
+
+    def recover(self, repair=True):
+        """Return the entries left by the last session (empty list if none).
+
+        repair=False leaves a torn journal as it is, for reading another
+        station's backups.
+        """
+        entries = []
+        snapshot_seq = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, "r") as f:
+                snapshot = json.load(f)
+            entries = snapshot["entries"]
+            snapshot_seq = snapshot["seq"]
+        elif os.path.exists(self.legacy_path):
+            with open(self.legacy_path, "r") as f:
+                entries = json.load(f)
+        self.seq = snapshot_seq
+
+        if os.path.exists(self.journal_path):
+            good_end = 0
+            torn = False
+            with open(self.journal_path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        crc = record.pop("crc")
+                    except (ValueError, KeyError):
+                        torn = True
+                        break
+                    if crc != _checksum(record):
+                        torn = True
+                        break
+                    good_end += len(line)
+                    if record["seq"] <= snapshot_seq:
+                        continue  # already folded into the snapshot
+                    if record["op"] == "add":
+                        entries.append(record["entry"])
+                    elif record["op"] == "drop":
+                        del entries[:record["count"]]
+                    self.seq = record["seq"]
+                    self.pending += 1
+            if torn and repair:
+                # Cut the damaged tail so new records are not written after it
+                with open(self.journal_path, "r+b") as f:
+                    f.truncate(good_end)
+        return entries
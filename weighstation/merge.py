@@ -0,0 +1,179 @@
+"""Merge the exports of many stations into one master workbook or CSV
+
+Head office collects the "RAMP & STATIC <station> <date>.xlsx" files (and,
+for sessions that never got exported, the stations' backups folders) and
+merges them into one file grouped by station and date:
+
+    python -m weighstation.merge "Master June 2025.xlsx" "D:\\Exports" "E:\\S2 backups"
+    python -m weighstation.merge master.csv "D:\\Exports"
+
+Exports are read with openpyxl's read-only streaming and the master
+workbook is written in write-only mode, so memory stays flat however many
+files and rows are merged. Only the headers are read up front to put the
+files in order; the rows are streamed straight to the output.
+"""
+import argparse
+import csv
+import os
+import time
+
+from weighstation.importer import find_workbooks, iter_export, read_header
+from weighstation.journal import JOURNAL_NAME, LEGACY_NAME, SNAPSHOT_NAME, Journal
+from weighstation.store import parse_day
+
+MASTER_COLUMNS = ("Station", "Date", "No.", "Axle Class", "Plate Number", "Cargo Type",
+                  "Ramp Bridge Weight", "Static Scale Weight", "Weight Difference", "Speed", "Source")
+SUMMARY_COLUMNS = ("Station", "Date", "Trucks", "Sources")
+JOURNAL_FILES = {JOURNAL_NAME, SNAPSHOT_NAME, LEGACY_NAME}
+
+
+def collect_sources(inputs):
+    """Split the inputs into export workbooks and autosave (backups) folders"""
+    workbooks = []
+    journals = []
+    for path in inputs:
+        if os.path.isdir(path):
+            workbooks.extend(find_workbooks(path))
+            for parent, _, names in os.walk(path):
+                if JOURNAL_FILES.intersection(names):
+                    journals.append(os.path.abspath(parent))
+        elif path.lower().endswith(".xlsx"):
+            workbooks.append(os.path.abspath(path))
+        else:
+            raise ValueError(f"Not an exported workbook or a folder: {path}")
+    return list(dict.fromkeys(workbooks)), journals
+
+
+def plan(workbooks, journals, failed):
+    """Sources in output order: [(sort key, station, date, source name, entries)].
+
+    Workbook entries are left as a lazy iterator; journal entries (one
+    unexported session each, so small) are grouped in memory.
+    """
+    groups = []
+    for path in workbooks:
+        try:
+            station, date = read_header(path)
+        except Exception as e:
+            failed[path] = str(e)
+            continue
+        groups.append((station, date, os.path.basename(path), lambda path=path: iter_export(path)))
+    for folder in journals:
+        try:
+            entries = Journal(folder).recover(repair=False)
+        except Exception as e:
+            failed[folder] = str(e)
+            continue
+        by_day = {}
+        for entry in entries:
+            by_day.setdefault((entry.get("station", ""), entry.get("date", "")), []).append(entry)
+        name = os.path.basename(folder) + " (unexported)"
+        for (station, date), group in by_day.items():
+            groups.append((station, date, name, lambda group=group: iter(group)))
+    return sorted(groups, key=lambda group: (group[0], parse_day(group[1]) or group[1], group[2]))
+
+
+def master_row(station, date, number, entry, source):
+    return (station, date, number, entry["axle_class"], entry["plate_number"], entry["cargo_type"],
+            entry["ramp_bridge"], entry["static_scale"], entry["ramp_bridge"] - entry["static_scale"],
+            entry["speed"], source)
+
+
+class CsvMaster:
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8-sig")  # BOM so Excel reads UTF-8
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(MASTER_COLUMNS)
+
+    def write(self, row):
+        self.writer.writerow(row)
+
+    def close(self, summary):
+        self.file.close()
+
+
+class WorkbookMaster:
+    """Write-only workbook: a Summary sheet first, then one sheet per station"""
+
+    def __init__(self, path):
+        from openpyxl import Workbook
+        self.path = path
+        self.workbook = Workbook(write_only=True)
+        self.summary = self.workbook.create_sheet("Summary")
+        self.summary.append(SUMMARY_COLUMNS)
+        self.sheets = {}
+
+    def write(self, row):
+        station = row[0] or "NO STATION"
+        sheet = self.sheets.get(station)
+        if sheet is None:
+            sheet = self.sheets[station] = self.workbook.create_sheet(station[:31])
+            sheet.append(MASTER_COLUMNS)
+        sheet.append(row)
+
+    def close(self, summary):
+        for (station, date), (trucks, sources) in summary.items():
+            self.summary.append((station, date, trucks, ", ".join(sources)))
+        self.workbook.save(self.path)
+
+
+def merge(inputs, output, progress=None):
+    """Merge exports and backups folders into output (.xlsx or .csv).
+
+    progress(done, total, source) is called after each source. Returns a
+    dict with rows, sources, skipped_rows, failed ({path: error}) and seconds.
+    """
+    start = time.perf_counter()
+    workbooks, journals = collect_sources(inputs)
+    failed = {}
+    groups = plan(workbooks, journals, failed)
+    master = CsvMaster(output) if output.lower().endswith(".csv") else WorkbookMaster(output)
+
+    rows = 0
+    skipped = 0
+    summary = {}  # (station, date) -> [trucks, source names], in output order
+    try:
+        for done, (station, date, source, entries) in enumerate(groups, 1):
+            counts = summary.setdefault((station, date), [0, []])
+            number = counts[0]
+            try:
+                for entry in entries():
+                    if entry is None:
+                        skipped += 1
+                        continue
+                    number += 1
+                    master.write(master_row(station, date, number, entry, source))
+            except Exception as e:
+                failed[source] = str(e)
+            rows += number - counts[0]
+            counts[0] = number
+            counts[1].append(source)
+            if progress:
+                progress(done, len(groups), source)
+    finally:
+        master.close(summary)
+
+    return {"rows": rows, "sources": len(groups), "skipped_rows": skipped, "failed": failed,
+            "seconds": time.perf_counter() - start}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge station exports into one master workbook or CSV")
+    parser.add_argument("output", help="master file to write (.xlsx or .csv)")
+    parser.add_argument("inputs", nargs="+", help="exported .xlsx files, or folders searched for exports and backups")
+    args = parser.parse_args()
+
+    def progress(done, total, source):
+        print(f"[{done}/{total}] {source}")
+
+    report = merge(args.inputs, args.output, progress)
+    for source, error in report["failed"].items():
+        print(f"Failed: {source}: {error}")
+    seconds = report["seconds"]
+    rate = report["rows"] / seconds if seconds else 0
+    print(f"Merged {report['rows']} rows from {report['sources']} sources into {args.output} "
+          f"in {seconds:.1f} s ({rate:.0f} rows/s), {report['skipped_rows']} incomplete rows skipped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Timing of the hot paths, written to a rotating local metrics log"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class Metrics:
+    """Record wall time (plus bytes written, row counts, ...) per action.
+
+    Each finished action becomes one JSON line in path, e.g.
+
+        {"ts": "2025-06-02T08:15:03", "action": "save_data", "ms": 4.2, "ok": true, "rows": 1}
+
+    The file rotates at max_bytes and keeps `backups` old files, so it can
+    stay switched on at busy stations. path=None keeps only the last record
+    (used by the debug overlay) and writes nothing. Safe to use from worker
+    threads; `last` is replaced in one assignment.
+    """
+
+    def __init__(self, path=None, max_bytes=1_000_000, backups=3):
+        self.path = path
+        self.last = None
+        self._logger = None
+        self._lock = threading.Lock()
+        self._max_bytes = max_bytes
+        self._backups = backups
+
+    def _log(self):
+        # Opened on first use so a read-only install only fails when it records
+        if self._logger is None:
+            import logging.handlers  # pulls in socket & co., so not at startup
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            handler = logging.handlers.RotatingFileHandler(
+                self.path, maxBytes=self._max_bytes, backupCount=self._backups, encoding="utf-8")
+            handler.setFormatter(logging.Formatter("%(message)s"))
+            logger = logging.getLogger(f"weighstation.metrics.{id(self)}")
+            logger.propagate = False
+            logger.setLevel(logging.INFO)
+            logger.addHandler(handler)
+            self._logger = logger
+        return self._logger
+
+    def record(self, action, seconds, ok=True, **fields):
+        record = {"ts": datetime.now().isoformat(timespec="seconds"), "action": action,
+                  "ms": round(seconds * 1000, 2), "ok": ok}
+        record.update(fields)
+        self.last = record
+        if self.path is None:
+            return record
+        try:
+            with self._lock:
+                self._log().info(json.dumps(record))
+        except Exception as e:
+            print(f"Failed to write metrics: {e}")
+        return record
+
+    @contextmanager
+    def timed(self, action, **fields):
+        """Time the with-block; set extra fields on the yielded dict
+
+            with metrics.timed("export") as m:
+                m["rows"] = len(entries)
+        """
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield fields
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            self.record(action, time.perf_counter() - start, ok, **fields)
+
+    def measure(self, action=None):
+        """Decorator form of timed(), named after the function by default"""
+        def decorate(function):
+            name = action or function.__name__
+
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.timed(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    def close(self):
+        if self._logger is not None:
+            for handler in list(self._logger.handlers):
+                handler.close()
+                self._logger.removeHandler(handler)
+            self._logger = None
+
+
+def describe(record):
+    """Short text for the status bar debug overlay"""
+    if not record:
+        return ""
+    extra = []
+    if "rows" in record:
+        extra.append(f"{record['rows']} rows")
+    if "bytes" in record:
+        extra.append(f"{record['bytes'] // 1024} KB")
+    text = f"{record['action']} {record['ms']:.0f} ms"
+    if extra:
+        text += " (" + ", ".join(extra) + ")"
+    return text if record["ok"] else text + " FAILED"
@@ -0,0 +1,123 @@
+"""Plate numbers seen in past sessions, ranked for autocomplete"""
+import json
+import os
+import time
+from datetime import datetime
+
+from weighstation.completion import CompletionIndex
+
+HALF_LIFE_DAYS = 30  # a visit counts half as much after this many days
+SAVE_EVERY = 20      # records between automatic saves
+
+
+def _score(count, last_seen, now):
+    age_days = max(0.0, (now - last_seen) / 86400)
+    return count * 0.5 ** (age_days / HALF_LIFE_DAYS)
+
+
+def _seen_at(entry):
+    """When a stored entry's truck was weighed: its day for imported rows
+    (saved_at is then the import time), otherwise its saved_at"""
+    times = [entry.get('saved_at'), entry.get('day')]
+    try:
+        return min(datetime.fromisoformat(text).timestamp() for text in times if text)
+    except ValueError:
+        return None
+
+
+class PlateDirectory:
+    """Count, last visit, axle class and cargo type for every plate seen.
+
+    Stored as one compact JSON list of [plate, count, last_seen, axle_class,
+    cargo_type] rows, which loads in a few milliseconds even for tens of
+    thousands of plates, plus the id of the newest stored entry counted, so
+    check() can catch up with entries it missed (imports, a crash before the
+    last save). Completions come from a CompletionIndex weighted by
+    frequency decayed by recency, so regulars seen this week rank first.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.plates = {}
+        self.index = CompletionIndex()
+        self.unsaved = 0
+        self.max_id = None  # newest entry store id counted, None if unknown
+
+    def load(self):
+        """Read the directory file; returns False if there is none yet"""
+        if not os.path.exists(self.path):
+            return False
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        rows = data["plates"]
+        self.max_id = data.get("max_id")
+        now = time.time()
+        self.plates = {row[0]: row[1:] for row in rows}
+        self.index = CompletionIndex(self.plates, {
+            plate: _score(count, last_seen, now) for plate, (count, last_seen, _, _) in self.plates.items()})
+        return True
+
+    def rebuild(self, entries):
+        """Build the directory from stored entries (first run), keeping when
+        each plate was last seen"""
+        self.plates = {}
+        self.index = CompletionIndex()
+        self.max_id = 0
+        self.catch_up(entries)
+
+    def catch_up(self, entries):
+        """Count stored entries that are not in the directory yet"""
+        for entry in entries:
+            self.record(entry, save=False, seen_at=_seen_at(entry))
+        self.save()
+
+    def check(self, store):
+        """Load the directory and add the entries stored since it was saved,
+        or rebuild it from store when it is missing or can't be matched"""
+        try:
+            if self.load() and self.max_id is not None and self.max_id <= store.max_id():
+                if self.max_id < store.max_id():
+                    self.catch_up(store.query(after_id=self.max_id))
+                return False
+        except Exception as e:
+            print(f"Failed to load plate directory, rebuilding it: {e}")
+        self.rebuild(store.query())
+        return True
+
+    def record(self, entry, save=True, seen_at=None):
+        """Count a saved entry; seen_at (epoch seconds) defaults to now"""
+        plate = entry['plate_number']
+        now = time.time()
+        seen_at = now if seen_at is None else seen_at
+        count, last_seen, axle_class, cargo_type = self.plates.get(plate, [0, 0, None, None])
+        if seen_at >= last_seen:
+            last_seen, axle_class, cargo_type = int(seen_at), entry.get('axle_class'), entry.get('cargo_type')
+        self.plates[plate] = [count + 1, last_seen, axle_class, cargo_type]
+        self.index.add(plate, _score(count + 1, last_seen, now))
+        if entry.get('id') is not None:
+            self.max_id = max(self.max_id or 0, entry['id'])
+        self.unsaved += 1
+        if save and self.unsaved >= SAVE_EVERY:
+            self.save()
+
+    def suggest(self, prefix, limit=5, min_chars=2):
+        """Best matching known plates, most frequent and recent first"""
+        if len(prefix) < min_chars:
+            return []
+        return self.index.complete(prefix, limit)
+
+    def lookup(self, plate):
+        """(axle_class, cargo_type) last used with plate, or None"""
+        row = self.plates.get(plate)
+        return (row[2], row[3]) if row else None
+
+    def save(self):
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        rows = [[plate] + self.plates[plate] for plate in sorted(self.plates)]
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"plates": rows, "max_id": self.max_id}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+        self.unsaved = 0
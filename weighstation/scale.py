@@ -0,0 +1,281 @@
+"""Live weight readings from scale indicators over TCP or a serial port
+
+Indicators at the stations stream one ASCII frame per reading, e.g.
+
+    ST,GS,+0012345kg      stable, gross, 12,345 kg
+    US,GS,+0012310kg      unstable (truck still moving)
+    OL,GS,+9999999kg      overload
+
+Each configured scale is followed by an asyncio task on a background
+thread. Frames are parsed, a StabilityFilter picks one settled weight per
+truck, and the result is put on a queue that the Tk thread drains with
+poll() (the same hand-off BackgroundJob uses). Scales are configured in
+scale.json next to the app:
+
+    {"scales": {"ramp_bridge": "tcp://192.168.1.50:4001",
+                "static_scale": "serial://COM3?baudrate=9600"},
+     "samples": 5, "tolerance_kg": 20, "min_weight_kg": 500}
+
+Try it without hardware:
+
+    python -m weighstation.scale simulate --port 4001
+    python -m weighstation.scale watch tcp://127.0.0.1:4001
+"""
+import argparse
+import asyncio
+import json
+import os
+import queue
+import random
+import re
+import threading
+from collections import deque
+from urllib.parse import parse_qs, urlsplit
+
+FRAME = re.compile(r"^\s*(?:(?P<status>ST|US|OL)\s*,\s*(?:(?:GS|NT|TR)\s*,\s*)?)?"
+                   r"(?P<weight>[+-]?\s*\d+(?:\.\d+)?)\s*(?P<unit>kg|t|lb)?\s*$", re.IGNORECASE)
+UNIT_KG = {"kg": 1, "t": 1000, "lb": 0.45359237}
+
+
+def parse_frame(line):
+    """(weight in kg, stable) for one indicator frame, None if unusable.
+
+    stable is True/False when the indicator sends an ST/US header and None
+    for bare numbers; overload frames and noise return None.
+    """
+    match = FRAME.match(line)
+    if not match:
+        return None
+    status = (match.group("status") or "").upper()
+    if status == "OL":
+        return None
+    weight = float(match.group("weight").replace(" ", ""))
+    weight *= UNIT_KG[(match.group("unit") or "kg").lower()]
+    stable = {"ST": True, "US": False}.get(status)
+    return round(weight), stable
+
+
+class StabilityFilter:
+    """Turn a stream of readings into one settled weight per truck.
+
+    A weight is reported once the last `samples` readings are within
+    tolerance of each other (and the indicator does not flag them as
+    unstable). Nothing more is reported until the platform drops below
+    min_weight again, i.e. the truck has left.
+    """
+
+    def __init__(self, samples=5, tolerance=20, min_weight=500):
+        self.tolerance = tolerance
+        self.min_weight = min_weight
+        self.window = deque(maxlen=samples)
+        self.reported = False
+
+    def feed(self, weight, stable=None):
+        """Returns the settled weight the first time it settles, else None"""
+        if weight < self.min_weight:
+            self.window.clear()
+            self.reported = False
+            return None
+        if stable is False:
+            self.window.clear()
+            return None
+        self.window.append(weight)
+        if self.reported or len(self.window) < self.window.maxlen:
+            return None
+        if max(self.window) - min(self.window) > self.tolerance:
+            return None
+        self.reported = True
+        return sorted(self.window)[len(self.window) // 2]
+
+
+# --- Transports: async iterators of text lines ---
+
+async def tcp_lines(host, port):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                raise ConnectionError("scale closed the connection")
+            yield line.decode("ascii", "replace")
+    finally:
+        writer.close()
+
+
+async def serial_lines(device, baudrate=9600):
+    import serial  # pyserial, only needed for serial scales
+    port = serial.Serial(device, baudrate, timeout=1)
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            # pyserial blocks, so each read runs on the default executor
+            line = await loop.run_in_executor(None, port.readline)
+            if line:
+                yield line.decode("ascii", "replace")
+    finally:
+        port.close()
+
+
+def open_lines(source):
+    """Line iterator for "tcp://host:port", "serial://COM3?baudrate=9600" or "serial:///dev/ttyUSB0" """
+    parts = urlsplit(source)
+    if parts.scheme == "tcp":
+        return tcp_lines(parts.hostname, parts.port)
+    if parts.scheme == "serial":
+        options = parse_qs(parts.query)
+        return serial_lines(parts.netloc or parts.path, int(options.get("baudrate", ["9600"])[0]))
+    raise ValueError(f"Unsupported scale source: {source}")
+
+
+class ScaleIngest:
+    """Follow every configured scale on an asyncio loop in a daemon thread.
+
+    sources maps an entry field ("ramp_bridge", "static_scale") to a source
+    string for open_lines(). Lost connections are retried every
+    retry_seconds. Events are ("reading", field, weight),
+    ("connected", field, source) and ("error", field, message); the Tk
+    thread collects them with poll().
+    """
+
+    def __init__(self, sources, samples=5, tolerance=20, min_weight=500, retry_seconds=3):
+        self.sources = dict(sources)
+        self.samples = samples
+        self.tolerance = tolerance
+        self.min_weight = min_weight
+        self.retry_seconds = retry_seconds
+        self.events = queue.Queue()
+        self._loop = None
+        self._stop = None
+        self._thread = None
+
+    @classmethod
+    def load(cls, path):
+        """ScaleIngest from scale.json, or None when no scales are configured"""
+        if not os.path.exists(path):
+            return None
+        with open(path, "r") as f:
+            data = json.load(f)
+        if not data.get("scales"):
+            return None
+        return cls(data["scales"], data.get("samples", 5), data.get("tolerance_kg", 20),
+                   data.get("min_weight_kg", 500), data.get("retry_seconds", 3))
+
+    def start(self):
+        self._thread = threading.Thread(target=lambda: asyncio.run(self._main()), daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(self._stop.set)
+
+    def poll(self):
+        """Events since the last call; call from the Tk thread"""
+        events = []
+        while True:
+            try:
+                events.append(self.events.get_nowait())
+            except queue.Empty:
+                return events
+
+    async def _main(self):
+        self._stop = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        tasks = [asyncio.ensure_future(self.follow(field, source)) for field, source in self.sources.items()]
+        await self._stop.wait()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def follow(self, field, source):
+        settle = StabilityFilter(self.samples, self.tolerance, self.min_weight)
+        while True:
+            try:
+                lines = open_lines(source)
+                connected = False
+                async for line in lines:
+                    if not connected:
+                        self.events.put(("connected", field, source))
+                        connected = True
+                    reading = parse_frame(line)
+                    if reading is None:
+                        continue
+                    weight = settle.feed(*reading)
+                    if weight is not None:
+                        self.events.put(("reading", field, weight))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.events.put(("error", field, f"{source}: {e}"))
+            await asyncio.sleep(self.retry_seconds)
+
+
+# --- Simulator for testing without an indicator ---
+
+def truck_frames(rng, idle=20, ramp=10, settle=25, noise=8):
+    """Frames for one truck: empty platform, drive on, settle, drive off"""
+    weight = rng.randrange(8000, 45000, 10)
+    for _ in range(idle):
+        yield "ST,GS,+0000000kg"
+    for step in range(1, ramp + 1):
+        yield f"US,GS,{weight * step // ramp:+08d}kg"
+    for step in range(settle):
+        wobble = rng.randint(-noise, noise) * max(0, 3 - step)  # dies down as the truck stops
+        yield f"{'US' if wobble else 'ST'},GS,{weight + wobble:+08d}kg"
+    for step in range(ramp - 1, -1, -1):
+        yield f"US,GS,{weight * step // ramp:+08d}kg"
+
+
+async def simulate(host="127.0.0.1", port=4001, interval=0.1, seed=None):
+    """Serve an endless stream of trucks to every TCP client"""
+    async def client(reader, writer):
+        rng = random.Random(seed)
+        try:
+            while True:
+                for frame in truck_frames(rng):
+                    writer.write((frame + "\r\n").encode("ascii"))
+                    await writer.drain()
+                    await asyncio.sleep(interval)
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(client, host, port)
+    async with server:
+        await server.serve_forever()
+
+
+async def watch(source, samples=5, tolerance=20, min_weight=500):
+    settle = StabilityFilter(samples, tolerance, min_weight)
+    async for line in open_lines(source):
+        reading = parse_frame(line)
+        if reading is not None:
+            weight = settle.feed(*reading)
+            if weight is not None:
+                print(f"Stable: {weight} kg")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scale indicator simulator and monitor")
+    commands = parser.add_subparsers(dest="command", required=True)
+    sim = commands.add_parser("simulate", help="serve simulated indicator frames over TCP")
+    sim.add_argument("--host", default="127.0.0.1")
+    sim.add_argument("--port", type=int, default=4001)
+    sim.add_argument("--interval", type=float, default=0.1, help="seconds between frames")
+    show = commands.add_parser("watch", help="print the stable weights read from a source")
+    show.add_argument("source", help="tcp://host:port or serial://COM3?baudrate=9600")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "simulate":
+            print(f"Simulating a scale indicator on tcp://{args.host}:{args.port}")
+            asyncio.run(simulate(args.host, args.port, args.interval))
+        else:
+            asyncio.run(watch(args.source))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Unique screenshot file names per destination folder"""
+import os
+import re
+import threading
+
+# PLATE.jpeg, PLATE(1).jpeg, PLATE(2).webp ...
+_NAME_PATTERN = re.compile(r"^(?P<stem>.+?)(?:\((?P<number>\d+)\))?\.(?:jpe?g|webp|png)$", re.IGNORECASE)
+
+_OPEN_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+
+
+def _file_name(stem, number, extension):
+    if number == 0:
+        return f"{stem}.{extension}"
+    return f"{stem}({number}).{extension}"
+
+
+class FilenameIndex:
+    """Remember the highest PLATE(n) suffix used in each folder.
+
+    A folder is listed once with os.scandir the first time it is used and
+    the index is updated with every file created afterwards, so picking the
+    next name needs no stat calls (slow on network-mapped drives). Files are
+    created with O_EXCL: if another station or program took the name in the
+    meantime the next number is tried instead of overwriting it.
+    """
+
+    def __init__(self):
+        self._folders = {}
+        self._lock = threading.Lock()
+
+    def _scan(self, folder):
+        highest = {}
+        with os.scandir(folder) as entries:
+            for entry in entries:
+                match = _NAME_PATTERN.match(entry.name)
+                if match:
+                    key = match.group("stem").lower()
+                    number = int(match.group("number") or 0)
+                    if number > highest.get(key, -1):
+                        highest[key] = number
+        return highest
+
+    def create(self, folder, stem, extension):
+        """Create the next free file for stem and return (path, open binary file)"""
+        key = stem.lower()
+        with self._lock:
+            highest = self._folders.get(folder)
+            if highest is None:
+                os.makedirs(folder, exist_ok=True)
+                highest = self._folders[folder] = self._scan(folder)
+            number = highest.get(key, -1) + 1
+            while True:
+                path = os.path.join(folder, _file_name(stem, number, extension))
+                try:
+                    fd = os.open(path, _OPEN_FLAGS)
+                except FileExistsError:
+                    number += 1
+                    continue
+                highest[key] = number
+                return path, os.fdopen(fd, "wb")
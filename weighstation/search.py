@@ -0,0 +1,118 @@
+"""Prefix filter and column sort orders for the history rows"""
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+from functools import lru_cache
+from itertools import compress
+
+
+def text_key(value):
+    return str(value).lower()
+
+
+def number_key(value):
+    """Numbers sort before anything that is not a number"""
+    try:
+        return (0, int(value), "")
+    except (TypeError, ValueError):
+        return (1, 0, str(value))
+
+
+@lru_cache(maxsize=4096)
+def date_key(value):
+    """Sort "January 02, 2025" style dates by calendar date (only a few distinct values)"""
+    try:
+        return (0, datetime.strptime(value.strip(), "%B %d, %Y").strftime("%Y-%m-%d"))
+    except (AttributeError, ValueError):
+        return (1, str(value))
+
+
+class RowIndex:
+    """Indexes over a list of row tuples that only ever grows at the end.
+
+    The prefix column is kept as a sorted list of (lowercased value, row
+    number), so a prefix filter is two bisects. Sort keys for a column are
+    computed once per row the first time that column is sorted. The sorted
+    order is then cached and kept sorted with insort as rows are added.
+    """
+
+    def __init__(self, rows, prefix_column, sort_keys):
+        self.rows = rows
+        self.prefix_column = prefix_column
+        self.sort_keys = sort_keys  # column -> key function
+        self._prefix = sorted((text_key(row[prefix_column]), idx) for idx, row in enumerate(rows))
+        self._keys = {}    # column -> [key per row]
+        self._orders = {}  # column -> ([sorted (key, row)], [row numbers in that order])
+
+    def add(self, idx):
+        """Index rows[idx] (just appended)"""
+        row = self.rows[idx]
+        insort(self._prefix, (text_key(row[self.prefix_column]), idx))
+        for column, keys in self._keys.items():
+            key = self.sort_keys[column](row[column])
+            keys.append(key)
+            order = self._orders.get(column)
+            if order is not None:
+                position = bisect_right(order[0], (key, idx))
+                order[0].insert(position, (key, idx))
+                order[1].insert(position, idx)
+
+    def update(self, idx, column):
+        """rows[idx][column] changed: refresh its key and drop the cached order"""
+        keys = self._keys.get(column)
+        if keys is not None:
+            keys[idx] = self.sort_keys[column](self.rows[idx][column])
+            self._orders.pop(column, None)
+
+    def keys(self, column):
+        keys = self._keys.get(column)
+        if keys is None:
+            key = self.sort_keys[column]
+            keys = self._keys[column] = [key(row[column]) for row in self.rows]
+        return keys
+
+    def order(self, column):
+        """Row numbers sorted by column (a cached list, do not modify)"""
+        order = self._orders.get(column)
+        if order is None:
+            keyed = sorted(zip(self.keys(column), range(len(self.rows))))
+            order = self._orders[column] = (keyed, [idx for _, idx in keyed])
+        return order[1]
+
+    def _matched(self, prefix):
+        """The (lowercased value, row number) pairs whose value starts with prefix"""
+        prefix = prefix.lower()
+        start = bisect_left(self._prefix, (prefix,))
+        end = bisect_right(self._prefix, (prefix + "\U0010ffff",))
+        return self._prefix[start:end]
+
+    def _is_broad(self, matched):
+        return len(matched) * 16 > len(self.rows)
+
+    def _mask(self, matched):
+        mask = bytearray(len(self.rows))
+        for _, idx in matched:
+            mask[idx] = 1
+        return mask
+
+    def matches(self, prefix):
+        """Row numbers (ascending) whose prefix column starts with prefix"""
+        matched = self._matched(prefix)
+        if self._is_broad(matched):
+            # Broad filter: picking from the rows in order beats sorting the matches
+            return list(compress(range(len(self.rows)), self._mask(matched)))
+        return sorted(idx for _, idx in matched)
+
+    def view(self, prefix="", sort_column=None):
+        """Row numbers to display, or None for all rows in their stored order"""
+        if not prefix:
+            return None if sort_column is None else self.order(sort_column)
+        if sort_column is None:
+            return self.matches(prefix)
+        matched = self._matched(prefix)
+        if self._is_broad(matched):
+            # Same for a sorted view: walk the cached order instead of sorting
+            order = self.order(sort_column)
+            return list(compress(order, map(self._mask(matched).__getitem__, order)))
+        rows = sorted(idx for _, idx in matched)
+        rows.sort(key=self.keys(sort_column).__getitem__)
+        return rows
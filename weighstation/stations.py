@@ -0,0 +1,38 @@
+"""The eleven weigh stations and the names derived from them"""
+
+STATIONS = [
+    "D STATION NO. 1", "D STATION NO. 2",
+    "NR STATION NO. 1", "NR STATION NO. 2", "NR STATION NO. 3",
+    "S STATION NO. 1", "S STATION NO. 2", "S STATION NO. 3",
+    "S STATION NO. 4", "S STATION NO. 5", "S STATION NO. 6",
+]
+
+# Short names used in exported file names
+STATION_SHORT_NAMES = {
+    "D STATION NO. 1": "D-1",
+    "D STATION NO. 2": "D-2",
+    "NR STATION NO. 1": "NR1",
+    "NR STATION NO. 2": "NR2",
+    "NR STATION NO. 3": "NR3",
+    "S STATION NO. 1": "S1",
+    "S STATION NO. 2": "S2",
+    "S STATION NO. 3": "S3",
+    "S STATION NO. 4": "S4",
+    "S STATION NO. 5": "S5",
+    "S STATION NO. 6": "S6",
+}
+
+
+def short_name(station):
+    return STATION_SHORT_NAMES.get(station, "STATION")
+
+
+def screenshot_folder_name(station):
+    """Sub-folder of the destination that holds a station's screenshots"""
+    short = STATION_SHORT_NAMES.get(station)
+    return f"SAMPLE {short}" if short else "SAMPLE"
+
+
+def export_file_name(station, date_text, extension="xlsx"):
+    """Default name for an export, e.g. "RAMP & STATIC D-1 January 01, 2025.xlsx" """
+    return f"RAMP & STATIC {short_name(station)} {date_text}.{extension}"
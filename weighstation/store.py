@@ -0,0 +1,221 @@
+"""Persistent SQLite store for every saved entry"""
+import os
+import sqlite3
+from collections import Counter
+from datetime import datetime
+
+DATE_FORMAT = "%B %d, %Y"  # format of the app's date field
+
+FIELDS = ("station", "date", "axle_class", "plate_number", "cargo_type",
+          "ramp_bridge", "static_scale", "speed", "destination")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    station TEXT NOT NULL,
+    date TEXT NOT NULL,
+    day TEXT,
+    axle_class INTEGER,
+    plate_number TEXT,
+    cargo_type TEXT,
+    ramp_bridge INTEGER,
+    static_scale INTEGER,
+    speed INTEGER,
+    destination TEXT,
+    saved_at TEXT NOT NULL,
+    exported_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_entries_plate ON entries (plate_number);
+CREATE INDEX IF NOT EXISTS idx_entries_station_day ON entries (station, day);
+CREATE INDEX IF NOT EXISTS idx_entries_day ON entries (day);
+CREATE TABLE IF NOT EXISTS imports (
+    file TEXT PRIMARY KEY,
+    rows INTEGER NOT NULL,
+    imported_at TEXT NOT NULL
+);
+"""
+
+
+def parse_day(date_text):
+    """Return the ISO day (YYYY-MM-DD) for a date typed in the app, or None"""
+    try:
+        return datetime.strptime(date_text.strip(), DATE_FORMAT).strftime("%Y-%m-%d")
+    except (ValueError, AttributeError):
+        return None
+
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+class EntryStore:
+    """Small repository around the entries table.
+
+    The free-text date is kept as typed, plus an ISO "day" column so date
+    ranges can use the (station, day) and day indexes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+
+    def _values(self, entry, saved_at):
+        return [entry.get(field) for field in FIELDS] + [parse_day(entry.get("date", "")), saved_at]
+
+    def insert(self, entry):
+        """Store one entry and return its id"""
+        with self.conn:
+            cursor = self.conn.execute(
+                f"INSERT INTO entries ({', '.join(FIELDS)}, day, saved_at) "
+                f"VALUES ({', '.join('?' * (len(FIELDS) + 2))})",
+                self._values(entry, _now()))
+        return cursor.lastrowid
+
+    def _insert_many(self, entries, exported):
+        saved_at = _now()
+        exported_at = saved_at if exported else None
+        rows = [self._values(entry, saved_at) + [exported_at] for entry in entries]
+        self.conn.executemany(
+            f"INSERT INTO entries ({', '.join(FIELDS)}, day, saved_at, exported_at) "
+            f"VALUES ({', '.join('?' * (len(FIELDS) + 3))})",
+            rows)
+        return len(rows)
+
+    def insert_many(self, entries, exported=False):
+        """Store many entries in one transaction and return how many were added"""
+        with self.conn:
+            return self._insert_many(entries, exported)
+
+    def imported_files(self):
+        """Paths of the workbooks already loaded by record_import() or
+        written by the app (mark_exported() with a file)"""
+        return {row[0] for row in self.conn.execute("SELECT file FROM imports")}
+
+    def record_import(self, file, entries):
+        """Store the entries read from an exported workbook, marked as exported,
+        and remember the file, in one transaction"""
+        with self.conn:
+            count = self._insert_many(entries, exported=True)
+            self._record_file(file, count, _now())
+        return count
+
+    def _where(self, plate=None, station=None, date_from=None, date_to=None, exported=None, after_id=None):
+        clauses = []
+        params = []
+        if after_id is not None:
+            clauses.append("id > ?")
+            params.append(after_id)
+        if plate:
+            clauses.append("plate_number = ?")
+            params.append(plate)
+        if station:
+            clauses.append("station = ?")
+            params.append(station)
+        if date_from:
+            clauses.append("day >= ?")
+            params.append(date_from)
+        if date_to:
+            clauses.append("day <= ?")
+            params.append(date_to)
+        if exported is not None:
+            clauses.append("exported_at IS NOT NULL" if exported else "exported_at IS NULL")
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def query(self, plate=None, station=None, date_from=None, date_to=None, exported=None, limit=None,
+              after_id=None):
+        """Return matching entries (oldest first) as dicts.
+
+        date_from and date_to are ISO days (inclusive). exported=True/False
+        limits the result to exported or not yet exported entries, after_id
+        to the entries stored after that one.
+        """
+        where, params = self._where(plate, station, date_from, date_to, exported, after_id)
+        sql = "SELECT * FROM entries" + where + " ORDER BY id"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params)]
+
+    def columns(self, fields, **filters):
+        """Plain tuples of the given columns for the entries matching the
+        query() filters, oldest first; cheaper than dicts for bulk analysis"""
+        unknown = set(fields) - set(FIELDS) - {"id", "day", "saved_at", "exported_at"}
+        if unknown:
+            raise ValueError(f"Unknown entry columns: {', '.join(sorted(unknown))}")
+        where, params = self._where(**filters)
+        cursor = self.conn.cursor()
+        cursor.row_factory = None
+        return cursor.execute(f"SELECT {', '.join(fields)} FROM entries{where} ORDER BY id", params).fetchall()
+
+    def mark_exported(self, ids, file=None):
+        """Flag the given entry ids as written to an Excel file.
+
+        file is the workbook's path; it is listed with the imports so the
+        importer does not load those rows a second time.
+        """
+        ids = list(ids)
+        now = _now()
+        with self.conn:
+            self.conn.executemany("UPDATE entries SET exported_at = ? WHERE id = ?",
+                                  [(now, entry_id) for entry_id in ids])
+            if file:
+                self._record_file(file, len(ids), now)
+        return len(ids)
+
+    def _record_file(self, file, rows, at):
+        self.conn.execute("INSERT OR REPLACE INTO imports (file, rows, imported_at) VALUES (?, ?, ?)",
+                          (file, rows, at))
+
+    def record_written(self, file, rows):
+        """List a workbook written from stored entries (batch re-export) with
+        the imports, so the importer skips it"""
+        with self.conn:
+            self._record_file(file, rows, _now())
+
+    def holds_exported(self, station, day, entries):
+        """True if every (plate, ramp, static) of entries is already stored as
+        exported for station on day, e.g. a workbook the app wrote itself"""
+        stored = Counter(self.columns(("plate_number", "ramp_bridge", "static_scale"),
+                                      station=station, date_from=day, date_to=day, exported=True))
+        wanted = Counter((entry['plate_number'], entry['ramp_bridge'], entry['static_scale']) for entry in entries)
+        return bool(wanted) and not wanted - stored
+
+    def sessions(self, station=None, date_from=None, date_to=None):
+        """(station, day, date as typed, entries) for every station and day, oldest first.
+
+        Entries whose date could not be read have no day and are left out.
+        """
+        where, params = self._where(station=station, date_from=date_from, date_to=date_to)
+        where += (" AND " if where else " WHERE ") + "day IS NOT NULL"
+        return self.conn.execute(
+            f"SELECT station, day, MIN(date), COUNT(*) FROM entries{where} "
+            f"GROUP BY station, day ORDER BY day, station", params).fetchall()
+
+    def counts_by_station_date(self, since_day):
+        """{(station, date): entries} for the days from since_day (ISO) on"""
+        rows = self.conn.execute(
+            "SELECT station, date, COUNT(*) FROM entries WHERE day >= ? GROUP BY station, date", (since_day,))
+        return {(station, date): count for station, date, count in rows}
+
+    def delete(self, ids):
+        """Remove entries by id (rolling back a save that failed half-way)"""
+        ids = list(ids)
+        with self.conn:
+            self.conn.executemany("DELETE FROM entries WHERE id = ?", [(entry_id,) for entry_id in ids])
+        return len(ids)
+
+    def count(self):
+        return self.conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def max_id(self):
+        """Id of the newest entry, 0 for an empty store"""
+        return self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM entries").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
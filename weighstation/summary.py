@@ -0,0 +1,149 @@
+"""Running per-station, per-day totals for the shift supervisor"""
+import json
+import os
+from datetime import datetime, timedelta
+
+from weighstation.store import parse_day
+
+KEEP_DAYS = 31  # days of totals kept in the summary file
+
+
+def load_limits(path):
+    """Gross weight limit (kg) per axle class from axle_limits.json, {} if there is none.
+
+    The file looks like {"limits_kg": {"12": 18000, "22": 30000}}; without
+    it the summary does not count overweight trucks.
+    """
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r") as f:
+        return {int(axle): int(limit) for axle, limit in json.load(f)["limits_kg"].items()}
+
+
+class DayTotals:
+    """Totals for one station and date, updated in O(1) per entry"""
+
+    __slots__ = ("trucks", "cargo", "diff_sum", "overweight")
+
+    def __init__(self, trucks=0, cargo=None, diff_sum=0, overweight=0):
+        self.trucks = trucks
+        self.cargo = cargo or {}
+        self.diff_sum = diff_sum
+        self.overweight = overweight
+
+    def average_diff(self):
+        return self.diff_sum / self.trucks if self.trucks else 0.0
+
+    def top_cargo(self, count=3):
+        return sorted(self.cargo.items(), key=lambda item: (-item[1], item[0]))[:count]
+
+
+class DailySummary:
+    """Truck count, trucks per cargo type, average weight difference and
+    overweight count per (station, date), kept up to date as entries are
+    saved instead of rescanning the history.
+
+    add() and remove() are exact inverses, so a save that fails half-way can
+    be rolled back. The totals are written to backups/daily_summary.json
+    next to the autosave journal; the entry store stays the source of
+    truth, and check() rebuilds the file from it if they disagree (e.g.
+    after a crash between the two writes).
+    """
+
+    def __init__(self, path, limits=None):
+        self.path = path
+        self.limits = limits or {}
+        self.days = {}  # (station, date) -> DayTotals
+
+    def _is_overweight(self, entry):
+        limit = self.limits.get(entry['axle_class'])
+        return limit is not None and entry['static_scale'] > limit
+
+    def add(self, entry, save=True):
+        totals = self.days.setdefault((entry['station'], entry['date']), DayTotals())
+        totals.trucks += 1
+        totals.cargo[entry['cargo_type']] = totals.cargo.get(entry['cargo_type'], 0) + 1
+        totals.diff_sum += entry['ramp_bridge'] - entry['static_scale']
+        totals.overweight += self._is_overweight(entry)
+        if save:
+            self.save()
+
+    def remove(self, entry, save=True):
+        """Undo add(entry)"""
+        key = (entry['station'], entry['date'])
+        totals = self.days.get(key)
+        if totals is None:
+            return
+        totals.trucks -= 1
+        left = totals.cargo.get(entry['cargo_type'], 0) - 1
+        if left > 0:
+            totals.cargo[entry['cargo_type']] = left
+        else:
+            totals.cargo.pop(entry['cargo_type'], None)
+        totals.diff_sum -= entry['ramp_bridge'] - entry['static_scale']
+        totals.overweight -= self._is_overweight(entry)
+        if totals.trucks <= 0:
+            del self.days[key]
+        if save:
+            self.save()
+
+    def totals(self, station, date):
+        """Totals for one station and date; an empty station adds up every station"""
+        if station:
+            return self.days.get((station, date), DayTotals())
+        combined = DayTotals()
+        for (_, day_date), totals in self.days.items():
+            if day_date == date:
+                combined.trucks += totals.trucks
+                combined.diff_sum += totals.diff_sum
+                combined.overweight += totals.overweight
+                for cargo, count in totals.cargo.items():
+                    combined.cargo[cargo] = combined.cargo.get(cargo, 0) + count
+        return combined
+
+    def since_day(self):
+        return (datetime.now() - timedelta(days=KEEP_DAYS)).strftime("%Y-%m-%d")
+
+    def rebuild(self, entries):
+        self.days = {}
+        for entry in entries:
+            self.add(entry, save=False)
+        self.save()
+
+    def check(self, store):
+        """Load the saved totals, or rebuild them from store when missing or stale"""
+        expected = store.counts_by_station_date(self.since_day())
+        try:
+            self.load()
+            actual = {key: totals.trucks for key, totals in self.days.items()
+                      if (parse_day(key[1]) or "") >= self.since_day()}
+            if actual == expected:
+                return False
+        except Exception as e:
+            print(f"Failed to load daily summary, rebuilding it: {e}")
+        self.rebuild(store.query(date_from=self.since_day()))
+        return True
+
+    def load(self):
+        self.days = {}
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "r") as f:
+            data = json.load(f)
+        if {int(axle): limit for axle, limit in data.get("limits", {}).items()} != self.limits:
+            raise ValueError("axle limits changed")
+        for station, date, trucks, cargo, diff_sum, overweight in data["days"]:
+            self.days[(station, date)] = DayTotals(trucks, cargo, diff_sum, overweight)
+
+    def save(self):
+        # Old days drop out of the file; entries without a parseable date are kept
+        since = self.since_day()
+        rows = [[station, date, t.trucks, t.cargo, t.diff_sum, t.overweight]
+                for (station, date), t in self.days.items() if (parse_day(date) or since) >= since]
+        folder = os.path.dirname(self.path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"limits": self.limits, "days": rows}, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
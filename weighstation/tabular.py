@@ -0,0 +1,102 @@
+"""Plain-data exports (CSV, Parquet, NumPy .npz) for the back office
+
+The Excel template is for people; these formats are for tools. They hold
+the same entries with one column per field, are written in chunks straight
+from the entry dicts without building a workbook, and take a fraction of a
+second for 100,000 rows (Parquet needs pyarrow; .npz only numpy).
+"""
+import csv
+import os
+
+from weighstation.export import ExportCancelled
+
+CHUNK_ROWS = 10000
+
+# Column name -> numpy dtype for .npz (strings get a fixed width from the data)
+COLUMNS = (
+    ("station", "U"),
+    ("date", "U"),
+    ("axle_class", "int32"),
+    ("plate_number", "U"),
+    ("cargo_type", "U"),
+    ("ramp_bridge", "int64"),
+    ("static_scale", "int64"),
+    ("weight_diff", "int64"),
+    ("speed", "int32"),
+)
+COLUMN_NAMES = tuple(name for name, _ in COLUMNS)
+
+
+def table_row(entry):
+    """Values of one entry in COLUMNS order, numbers as integers"""
+    ramp = int(entry['ramp_bridge'])
+    static = int(entry['static_scale'])
+    return (entry['station'], entry['date'], int(entry['axle_class']), entry['plate_number'],
+            entry['cargo_type'], ramp, static, ramp - static, int(entry['speed']))
+
+
+def _chunks(entries, progress, cancel):
+    """table_row() tuples in CHUNK_ROWS lists, checking cancel between chunks"""
+    total = len(entries)
+    for start in range(0, total, CHUNK_ROWS):
+        if cancel is not None and cancel.is_set():
+            raise ExportCancelled()
+        yield [table_row(entry) for entry in entries[start:start + CHUNK_ROWS]]
+        if progress:
+            progress(min(start + CHUNK_ROWS, total), total)
+
+
+def write_csv(f, entries, progress=None, cancel=None):
+    writer = csv.writer(f)
+    writer.writerow(COLUMN_NAMES)
+    for rows in _chunks(entries, progress, cancel):
+        writer.writerows(rows)
+
+
+def write_parquet(f, entries, progress=None, cancel=None):
+    import pyarrow as pa  # optional, only for Parquet exports
+    import pyarrow.parquet as pq
+    schema = pa.schema([(name, pa.string() if kind == "U" else getattr(pa, kind)()) for name, kind in COLUMNS])
+    with pq.ParquetWriter(f, schema) as writer:
+        for rows in _chunks(entries, progress, cancel):
+            # One row group per chunk
+            writer.write_table(pa.Table.from_arrays([list(column) for column in zip(*rows)], schema=schema))
+
+
+def write_npz(f, entries, progress=None, cancel=None):
+    import numpy as np  # optional, only for .npz exports
+    rows = [row for chunk in _chunks(entries, progress, cancel) for row in chunk]
+    columns = list(zip(*rows)) if rows else [()] * len(COLUMNS)
+    arrays = {name: np.array(values, dtype=str if kind == "U" else kind)
+              for (name, kind), values in zip(COLUMNS, columns)}
+    np.savez_compressed(f, **arrays)
+
+
+WRITERS = {".csv": write_csv, ".parquet": write_parquet, ".npz": write_npz}
+
+
+def is_table_path(path):
+    return os.path.splitext(path)[1].lower() in WRITERS
+
+
+def write_table(path, entries, progress=None, cancel=None):
+    """Write entries to path in the format its extension names; returns the row count.
+
+    The file is written under a temporary name and moved into place, so a
+    cancelled or failed export never leaves half a file behind.
+    """
+    write = WRITERS[os.path.splitext(path)[1].lower()]
+    tmp_path = path + ".tmp"
+    try:
+        if write is write_csv:
+            with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+                write(f, entries, progress, cancel)
+        else:
+            with open(tmp_path, "wb") as f:
+                write(f, entries, progress, cancel)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(entries)
@@ -0,0 +1,36 @@
+"""Parsed copy of the Excel template kept in memory between exports"""
+import os
+import pickle
+import threading
+
+
+class TemplateCache:
+    """Parse the template once and hand out fresh copies for each export.
+
+    The parsed workbook is kept as a pickled snapshot, which loads several
+    times faster than re-reading the xlsx and, unlike copy.deepcopy, keeps the
+    shared style tables intact. The snapshot is rebuilt when the file's
+    modification time or size changes.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._key = None
+        self._snapshot = None
+        self._lock = threading.Lock()
+
+    def _file_key(self):
+        stat = os.stat(self.path)
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def load(self):
+        """Return a new workbook that can be filled and saved independently"""
+        key = self._file_key()
+        with self._lock:
+            if self._snapshot is None or key != self._key:
+                import openpyxl
+                workbook = openpyxl.load_workbook(self.path)
+                self._snapshot = pickle.dumps(workbook, pickle.HIGHEST_PROTOCOL)
+                self._key = key
+            snapshot = self._snapshot
+        return pickle.loads(snapshot)
@@ -0,0 +1,22 @@
+"""Key-by-key validators for the entry fields (used as Tk validatecommands)"""
+
+
+def validate_integer(new_value):
+    if new_value == "":
+        return True
+    return new_value.isdigit()
+
+
+def validate_axle_class_input(P):
+    if P == "":
+        return True  # Allow clearing the field
+    if P.isdigit() and len(P) <= 2:
+        return True
+    return False
+
+
+def validate_plate_number(P):
+    """Allow letters, numbers, and spaces"""
+    if P == "":
+        return True  # Allow clearing
+    return all(c.isalnum() or c.isspace() for c in P)
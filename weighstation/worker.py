@@ -0,0 +1,66 @@
+"""Run slow work off the Tk thread and hand results back to it"""
+import queue
+import threading
+
+
+class BackgroundJob:
+    """Run work(job) on a daemon thread.
+
+    Tk widgets may only be touched from the main thread, so the worker never
+    calls back directly: progress, the result and any exception are put on a
+    queue that is drained by polling through schedule (normally root.after).
+    The work function can call job.report(...) for progress and should check
+    job.cancelled between steps.
+    """
+
+    def __init__(self, schedule, work, on_done, on_error=None, on_progress=None, poll_ms=50):
+        self.schedule = schedule
+        self.work = work
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.poll_ms = poll_ms
+        self.cancelled = threading.Event()
+        self.running = False
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self.running = True
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        self.schedule(self.poll_ms, self._poll)
+        return self
+
+    def cancel(self):
+        self.cancelled.set()
+
+    def report(self, *args):
+        """Called from the worker thread to pass progress to on_progress"""
+        self._queue.put(("progress", args))
+
+    def _run(self):
+        try:
+            result = self.work(self)
+        except BaseException as e:
+            self._queue.put(("error", e))
+        else:
+            self._queue.put(("done", result))
+
+    def _poll(self):
+        while True:
+            try:
+                kind, payload = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if kind == "progress":
+                if self.on_progress:
+                    self.on_progress(*payload)
+                continue
+            self.running = False
+            if kind == "done":
+                self.on_done(payload)
+            elif self.on_error:
+                self.on_error(payload)
+            return
+        self.schedule(self.poll_ms, self._poll)